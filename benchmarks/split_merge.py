@@ -0,0 +1,154 @@
+import argparse
+import filecmp
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from nextcloud_client import NextcloudClient
+
+# Vergleicht die Split/Merge-Engine (copy_range) mit der bisherigen Implementierung.
+# Jede Phase läuft in einem eigenen Prozess, damit Zeit und Spitzen-RSS getrennt gemessen werden.
+#
+#   python benchmarks/split_merge.py --size 4G --parts 2
+
+
+def legacy_split(file_path, temp_folder, parts):
+    # Bisherige Implementierung: jeder Teil wird komplett in den Speicher gelesen
+    file_size = os.path.getsize(file_path)
+    part_size = file_size // parts
+    temp_folder = temp_folder + '/' + os.path.basename(file_path)
+    os.makedirs(temp_folder, exist_ok=True)
+    with open(file_path, 'rb') as f:
+        for i in range(parts):
+            part_path = os.path.join(temp_folder, f"{os.path.basename(file_path)}.part{i}")
+            with open(part_path, 'wb') as part_file:
+                if i == parts - 1:
+                    part_file.write(f.read())
+                else:
+                    part_file.write(f.read(part_size))
+    return temp_folder
+
+
+def legacy_merge(local_folder, temp_folder, filename, parts):
+    # Bisherige Implementierung: Kopie über 1-MiB-Puffer in Python
+    base_name = os.path.basename(filename)
+    temp_folder = os.path.join(temp_folder, base_name)
+    output_path = os.path.join(local_folder, base_name)
+    with open(output_path, 'wb') as out_f:
+        for i in range(parts):
+            with open(os.path.join(temp_folder, f"{base_name}.part{i}"), 'rb') as pf:
+                while True:
+                    chunk = pf.read(1024 * 1024)
+                    if not chunk:
+                        break
+                    out_f.write(chunk)
+    return True
+
+
+def parse_size(value):
+    units = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+    value = str(value).strip().upper().rstrip('B').rstrip('I')
+    if value and value[-1] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(value)
+
+
+def peak_rss():
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: KiB, macOS: Bytes
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+def run_phase(engine, phase, source, work, parts, part_size):
+    client = NextcloudClient()
+    name = os.path.basename(source)
+    split_dir = os.path.join(work, f"{engine}-split")
+    merged_dir = os.path.join(work, f"{engine}-merged")
+    os.makedirs(merged_dir, exist_ok=True)
+    start = time.perf_counter()
+    if phase == 'split':
+        if engine == 'legacy':
+            legacy_split(source, split_dir, parts)
+        else:
+            client.split_file(source, split_dir, parts, part_size)
+    else:
+        if engine == 'legacy':
+            legacy_merge(merged_dir, split_dir, name, parts)
+        else:
+            # merge_file_parts räumt den Split-Ordner auf, daher auf einer Kopie der Hardlinks arbeiten
+            link_dir = os.path.join(work, f"{engine}-links", name)
+            os.makedirs(link_dir, exist_ok=True)
+            for f in os.listdir(os.path.join(split_dir, name)):
+                os.link(os.path.join(split_dir, name, f), os.path.join(link_dir, f))
+            client.merge_file_parts(merged_dir, os.path.dirname(link_dir), name)
+    return {'seconds': time.perf_counter() - start, 'peak_rss': peak_rss()}
+
+
+def create_source(path, size):
+    block = os.urandom(1024 * 1024)
+    with open(path, 'wb') as f:
+        written = 0
+        while written < size:
+            n = min(len(block), size - written)
+            f.write(block[:n])
+            written += n
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark Split/Merge: bisherige Implementierung vs. copy_range')
+    parser.add_argument('--size', default='2G', help='Größe der Testdatei, z. B. 512M, 4G')
+    parser.add_argument('--parts', type=int, default=2)
+    parser.add_argument('--part-size', help='Zielgröße je Teil für die neue Engine (statt --parts)')
+    parser.add_argument('--dir', help='Arbeitsverzeichnis (Standard: Temp)')
+    parser.add_argument('--json', help='Ergebnisse zusätzlich als JSON speichern')
+    parser.add_argument('--phase', nargs=6, metavar=('ENGINE', 'PHASE', 'SOURCE', 'WORK', 'PARTS', 'PART_SIZE'),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.phase:
+        engine, phase, source, work, parts, part_size = args.phase
+        result = run_phase(engine, phase, source, work, int(parts), int(part_size) or None)
+        print(json.dumps(result))
+        return 0
+
+    size = parse_size(args.size)
+    part_size = parse_size(args.part_size) if args.part_size else 0
+    work = tempfile.mkdtemp(prefix='pyuploader-bench-', dir=args.dir)
+    results = {'size': size, 'parts': args.parts, 'part_size': part_size or None, 'runs': {}}
+    try:
+        source = os.path.join(work, 'source.bin')
+        create_source(source, size)
+        for engine in ('legacy', 'copy_range'):
+            for phase in ('split', 'merge'):
+                # Die bisherige Implementierung kennt nur eine Anzahl an Teilen
+                part_arg = part_size if engine == 'copy_range' else 0
+                out = subprocess.run([sys.executable, os.path.abspath(__file__), '--phase', engine, phase,
+                                      source, work, str(args.parts), str(part_arg)],
+                                     check=True, capture_output=True, text=True).stdout
+                run = json.loads(out.strip().splitlines()[-1])
+                run['mb_s'] = size / (1024 * 1024) / run['seconds'] if run['seconds'] else None
+                results['runs'][f"{engine}/{phase}"] = run
+                rss = f"{run['peak_rss'] / (1024 * 1024):8.1f} MiB" if run['peak_rss'] else '       n/a'
+                print(f"{engine:>10} {phase:<5} {run['seconds']:8.2f} s {run['mb_s']:9.1f} MB/s  peak RSS {rss}")
+        merged = [os.path.join(work, f"{e}-merged", 'source.bin') for e in ('legacy', 'copy_range')]
+        results['identical'] = all(filecmp.cmp(source, p, shallow=False) for p in merged)
+        print(f"Ergebnis identisch mit Quelle: {results['identical']}")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
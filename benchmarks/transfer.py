@@ -0,0 +1,307 @@
+import argparse
+import contextlib
+import filecmp
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from nextcloud_client import NextcloudClient, RequestStats
+from webdav_server import WebDAVServer
+
+# Transfer-Benchmarks gegen einen lokalen WebDAV-Server im selben Prozess (optional mit Latenz und
+# gedrosselter Bandbreite). Jeder Workload läuft in einem eigenen Prozess; je Phase werden Zeit, MB/s,
+# Requests/s, Retries und Spitzen-RSS erfasst. Mit --json speichern, mit --compare gegen einen älteren
+# Stand vergleichen:
+#
+#   python benchmarks/transfer.py --latency 20 --json bench-new.json --compare bench-old.json
+
+WORKLOADS = ('large', 'split', 'dedup', 'small', 'tree')
+
+
+def parse_size(value):
+    units = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+    value = str(value).strip().upper().rstrip('B').rstrip('I')
+    if value and value[-1] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(value)
+
+
+def reset_peak_rss():
+    # Linux: VmHWM über clear_refs zurücksetzen, damit der Spitzenwert je Phase gilt
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss():
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: KiB, macOS: Bytes
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+class Phases:
+    # Misst benannte Phasen eines Workloads; Request-Zahlen kommen aus dem RequestStats-Hook des Clients
+    def __init__(self, client):
+        self.client = client
+        self.stats = RequestStats()
+        client.add_request_hook(self.stats)
+        self.results = {}
+
+    @contextlib.contextmanager
+    def phase(self, name, size=0):
+        self.stats.reset()
+        retries = self.client.get_request_metrics()['retries']
+        reset_peak_rss()
+        start = time.perf_counter()
+        yield
+        seconds = time.perf_counter() - start
+        summary = self.stats.summary()
+        self.results[name] = {
+            'seconds': round(seconds, 4),
+            'bytes': size,
+            'mb_s': round(size / (1024 * 1024) / seconds, 2) if size and seconds else None,
+            'requests': summary['requests'],
+            'requests_s': round(summary['requests'] / seconds, 1) if seconds else None,
+            'retries': self.client.get_request_metrics()['retries'] - retries,
+            'errors': summary['errors'],
+            'latency_p50_ms': summary['latency_p50_ms'],
+            'latency_p95_ms': summary['latency_p95_ms'],
+            'peak_rss': peak_rss(),
+            'by_method': summary['by_method'],
+        }
+
+
+def create_file(path, size):
+    block = os.urandom(1024 * 1024)
+    with open(path, 'wb') as f:
+        written = 0
+        while written < size:
+            n = min(len(block), size - written)
+            f.write(block[:n])
+            written += n
+
+
+def create_tree(folder, depth, fanout, files, file_size, prefix=''):
+    # files Dateien je Ordner, fanout Unterordner je Ebene bis depth; liefert die Gesamtgröße
+    os.makedirs(folder, exist_ok=True)
+    total = 0
+    for i in range(files):
+        create_file(os.path.join(folder, f"{prefix}f{i}.bin"), file_size)
+        total += file_size
+    if depth > 0:
+        for i in range(fanout):
+            total += create_tree(os.path.join(folder, f"d{i}"), depth - 1, fanout, files, file_size)
+    return total
+
+
+def same_tree(left, right):
+    compare = filecmp.dircmp(left, right)
+    if compare.left_only or compare.right_only or compare.funny_files:
+        return False
+    if any(not filecmp.cmp(os.path.join(left, f), os.path.join(right, f), shallow=False)
+           for f in compare.common_files):
+        return False
+    return all(same_tree(os.path.join(left, d), os.path.join(right, d)) for d in compare.common_dirs)
+
+
+def run_workload(name, config, work):
+    server = WebDAVServer(os.path.join(work, 'server'), latency=config['latency'] / 1000.0,
+                          bandwidth=config['bandwidth'], bulk=config['bulk'],
+                          depth_infinity=config['depth_infinity'])
+    url = server.start()
+    workers = config['workers']
+    client = NextcloudClient(pool_size=max(10, workers * 2))
+    client.set_credentials(url, 'bench', 'bench')
+    phases = Phases(client)
+    local = os.path.join(work, 'local')
+    restore = os.path.join(work, 'restore')
+    os.makedirs(local)
+    os.makedirs(restore)
+    os.makedirs(os.path.join(server.root, 'bench'))
+    result = {'verified': False}
+
+    if name in ('large', 'split', 'dedup'):
+        source = os.path.join(local, f"{name}.bin")
+        size = config['size']
+        create_file(source, size)
+        if name == 'dedup':
+            with phases.phase('upload', size):
+                ok = client.upload_file_dedup(source, 'bench', workers=workers)['success']
+            # Unveränderte Datei: jeder Chunk muss im Chunk-Store (in <ab>/-Unterordnern) gefunden werden
+            with phases.phase('reupload', size):
+                again = client.upload_file_dedup(source, 'bench', workers=workers)
+            ok = ok and again['success'] and again['chunks_uploaded'] == 0
+            with phases.phase('download', size):
+                ok = client.download_file_dedup('bench', os.path.basename(source), restore,
+                                                workers=workers)['success'] and ok
+        elif name == 'large':
+            with phases.phase('upload', size):
+                ok = client.upload_file_chunked(source, 'bench', workers=workers)['success']
+            with phases.phase('download', size):
+                ok = client.download_file_segmented('bench', os.path.basename(source), restore,
+                                                    segments=workers)['success'] and ok
+        else:
+            with phases.phase('upload', size):
+                ok = client.upload_file_split(source, 'bench', config['parts'], workers=workers)['success']
+            with phases.phase('download', size):
+                ok = client.download_file_parts('bench', os.path.basename(source), restore,
+                                                workers=workers)['success'] and ok
+        result['verified'] = ok and filecmp.cmp(source, os.path.join(restore, os.path.basename(source)),
+                                                shallow=False)
+    else:
+        source = os.path.join(local, name)
+        if name == 'small':
+            # viele kleine Dateien, je 100 in einem Ordner
+            size = 0
+            for i in range(config['files']):
+                folder = os.path.join(source, f"batch{i // 100:04d}")
+                os.makedirs(folder, exist_ok=True)
+                create_file(os.path.join(folder, f"f{i}.bin"), config['file_size'])
+                size += config['file_size']
+        else:
+            size = create_tree(source, config['tree_depth'], config['tree_fanout'], config['tree_files'],
+                               config['file_size'])
+        with phases.phase('upload', size):
+            ok = client.upload_folder_parallel(source, 'bench', workers=workers)['success']
+        with phases.phase('list'):
+            tree = client.list_tree(f"bench/{name}")
+        result['entries'] = len(tree or {})
+        target = os.path.join(restore, name)
+        with phases.phase('download', size):
+            ok = client.sync_folder(target, f"bench/{name}", direction='download',
+                                    index_path=os.path.join(work, 'sync.sqlite'), workers=workers)['success'] and ok
+        # Zweiter Abgleich ohne Änderungen darf nichts übertragen, auch nicht in Unterordnern
+        with phases.phase('resync'):
+            again = client.sync_folder(target, f"bench/{name}", direction='download',
+                                       index_path=os.path.join(work, 'sync.sqlite'), workers=workers)
+        ok = again['success'] and again['files_transferred'] == 0 and ok
+        result['verified'] = ok and same_tree(source, target)
+
+    result['phases'] = phases.results
+    result['server_requests'] = dict(server.counters)
+    result['connections'] = client.get_connection_stats()
+    result['scheduler'] = client.get_request_metrics()
+    client.close()
+    server.stop()
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results, baseline=None):
+    print(f"{'Workload':<8} {'Phase':<9} {'Zeit':>9} {'MB/s':>9} {'Req/s':>8} {'Requests':>9} {'Retries':>8}"
+          f" {'Peak RSS':>10}" + ('  Vergleich' if baseline else ''))
+    for name, workload in results['workloads'].items():
+        for phase, run in workload.get('phases', {}).items():
+            rss = f"{run['peak_rss'] / (1024 * 1024):7.1f} MiB" if run['peak_rss'] else '       n/a'
+            mb_s = f"{run['mb_s']:9.1f}" if run['mb_s'] else '        -'
+            line = (f"{name:<8} {phase:<9} {run['seconds']:8.2f}s {mb_s} {run['requests_s'] or 0:8.1f}"
+                    f" {run['requests']:9d} {run['retries']:8d} {rss}")
+            old = ((baseline or {}).get('workloads', {}).get(name, {}).get('phases', {}).get(phase))
+            if old and old['seconds']:
+                change = (run['seconds'] - old['seconds']) / old['seconds'] * 100
+                line += f"  {old['seconds']:.2f}s -> {run['seconds']:.2f}s ({change:+.1f} %)"
+            print(line)
+        if 'error' in workload:
+            print(f"{name:<8} Fehler: {workload['error']}")
+        elif not workload.get('verified'):
+            print(f"{name:<8} Ergebnis stimmt nicht mit der Quelle überein")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Transfer-Benchmarks gegen einen lokalen WebDAV-Server')
+    parser.add_argument('--workload', action='append', choices=WORKLOADS,
+                        help='nur diese Workloads (mehrfach möglich, Standard: alle)')
+    parser.add_argument('--size', default='256M', help='Dateigröße für large/split/dedup')
+    parser.add_argument('--parts', type=int, default=4, help='Teile für split')
+    parser.add_argument('--files', type=int, default=2000, help='Anzahl Dateien für small')
+    parser.add_argument('--file-size', default='4K', help='Größe der kleinen Dateien (small/tree)')
+    parser.add_argument('--tree-depth', type=int, default=4)
+    parser.add_argument('--tree-fanout', type=int, default=4)
+    parser.add_argument('--tree-files', type=int, default=3, help='Dateien je Ordner im Baum')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--latency', type=float, default=0.0, help='Server-Latenz je Request in ms')
+    parser.add_argument('--bandwidth', help='gemeinsame Bandbreite des Servers pro Sekunde, z. B. 50M')
+    parser.add_argument('--no-bulk', action='store_true', help='Server ohne Nextcloud Bulk-Upload')
+    parser.add_argument('--depth-infinity', choices=['clamp', 'reject', 'allow'], default='clamp',
+                        help='PROPFIND Depth: infinity beschränken (wie Nextcloud), mit 403 ablehnen oder erlauben')
+    parser.add_argument('--dir', help='Arbeitsverzeichnis (Standard: Temp)')
+    parser.add_argument('--json', help='Ergebnisse als JSON speichern')
+    parser.add_argument('--compare', help='JSON eines früheren Laufs zum Vergleich')
+    parser.add_argument('--run', nargs=3, metavar=('WORKLOAD', 'CONFIG', 'WORK'), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run:
+        name, config, work = args.run
+        # Meldungen des Clients nicht mit dem JSON-Ergebnis mischen
+        with contextlib.redirect_stdout(sys.stderr):
+            result = run_workload(name, json.loads(config), work)
+        print(json.dumps(result))
+        return 0
+
+    config = {'size': parse_size(args.size), 'parts': args.parts, 'files': args.files,
+              'file_size': parse_size(args.file_size), 'tree_depth': args.tree_depth,
+              'tree_fanout': args.tree_fanout, 'tree_files': args.tree_files, 'workers': args.workers,
+              'latency': args.latency, 'bandwidth': parse_size(args.bandwidth) if args.bandwidth else None,
+              'bulk': not args.no_bulk, 'depth_infinity': args.depth_infinity}
+    results = {'meta': {'commit': git_commit(), 'date': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+                        'python': platform.python_version(), 'platform': platform.platform(), 'config': config},
+               'workloads': {}}
+    for name in args.workload or WORKLOADS:
+        work = tempfile.mkdtemp(prefix=f'pyuploader-bench-{name}-', dir=args.dir)
+        try:
+            proc = subprocess.run([sys.executable, os.path.abspath(__file__), '--run', name, json.dumps(config), work],
+                                  capture_output=True, text=True)
+            if proc.returncode == 0:
+                results['workloads'][name] = json.loads(proc.stdout.strip().splitlines()[-1])
+            else:
+                results['workloads'][name] = {'error': proc.stderr.strip().splitlines()[-1] if proc.stderr else
+                                              f"Exit-Code {proc.returncode}"}
+        finally:
+            shutil.rmtree(work, ignore_errors=True)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f"Vergleich mit {baseline['meta'].get('commit')} ({baseline['meta'].get('date')})")
+        if baseline['meta'].get('config') != config:
+            print("Achtung: Baseline lief mit anderen Parametern")
+    print_results(results, baseline)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    failed = any('error' in w or not w.get('verified') for w in results['workloads'].values())
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
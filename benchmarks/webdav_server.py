@@ -0,0 +1,354 @@
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import quote, unquote, urlparse
+from xml.sax.saxutils import escape
+
+# Lokaler WebDAV-Ersatz für Benchmarks: PUT/GET (mit Range)/HEAD/MKCOL/PROPFIND/DELETE/MOVE,
+# Nextcloud Chunked Upload (uploads/ + MOVE .file) und optional Bulk-Upload.
+# Latenz je Request und eine gemeinsame Bandbreite lassen sich einstellen; Bodies werden gestreamt,
+# damit der Server im selben Prozess die RSS-Messung nicht verfälscht.
+
+BLOCK_SIZE = 1024 * 1024
+
+
+class Throttle:
+    # Token Bucket für die gemeinsame Bandbreite aller Verbindungen (Bytes/s, beide Richtungen)
+    def __init__(self, rate):
+        self.rate = rate
+        self.allowance = 0.0
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def consume(self, n):
+        if not self.rate:
+            return
+        with self.lock:
+            now = time.monotonic()
+            self.allowance = min(self.rate, self.allowance + (now - self.last) * self.rate) - n
+            self.last = now
+            wait = -self.allowance / self.rate if self.allowance < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+
+class BodyReader(io.RawIOBase):
+    # Dateiartige Sicht auf iter_body(), damit sich der Bulk-Body zeilen- und blockweise lesen lässt
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.rest = b''
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if not self.rest:
+            self.rest = next(self.chunks, b'')
+        n = min(len(buffer), len(self.rest))
+        buffer[:n] = self.rest[:n]
+        self.rest = self.rest[n:]
+        return n
+
+
+class WebDAVHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Header und Body gehen in getrennten Writes raus; mit Nagle + Delayed ACK kostet das ~40 ms je Antwort
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    # --- Hilfsfunktionen -------------------------------------------------
+
+    def local_path(self, path=None):
+        # /remote.php/webdav/<p>, /remote.php/dav/files/<user>/<p>, /remote.php/dav/uploads/<user>/<id>/<chunk>
+        path = unquote(urlparse(path or self.path).path)
+        if path.startswith('/remote.php/webdav'):
+            rel = path[len('/remote.php/webdav'):]
+        elif path.startswith('/remote.php/dav/files/'):
+            rel = path[len('/remote.php/dav/files/'):].partition('/')[2]
+        elif path.startswith('/remote.php/dav/uploads/'):
+            rel = '.uploads/' + path[len('/remote.php/dav/uploads/'):].partition('/')[2]
+        else:
+            return None
+        return os.path.join(self.server.root, *[p for p in rel.split('/') if p])
+
+    def count(self):
+        with self.server.lock:
+            self.server.counters[self.command] = self.server.counters.get(self.command, 0) + 1
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+    def iter_body(self):
+        # Request-Body in Blöcken lesen (Content-Length oder Transfer-Encoding: chunked)
+        if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            while True:
+                size = int(self.rfile.readline().split(b';')[0].strip(), 16)
+                if size == 0:
+                    self.rfile.readline()
+                    return
+                remaining = size
+                while remaining:
+                    data = self.rfile.read(min(remaining, BLOCK_SIZE))
+                    self.server.throttle.consume(len(data))
+                    remaining -= len(data)
+                    yield data
+                self.rfile.readline()
+        remaining = int(self.headers.get('Content-Length') or 0)
+        while remaining:
+            data = self.rfile.read(min(remaining, BLOCK_SIZE))
+            if not data:
+                return
+            self.server.throttle.consume(len(data))
+            remaining -= len(data)
+            yield data
+
+    def discard_body(self):
+        for _ in self.iter_body():
+            pass
+
+    def reply(self, status, data=b'', headers=None):
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        if data and self.command != 'HEAD':
+            self.server.throttle.consume(len(data))
+            self.wfile.write(data)
+
+    @staticmethod
+    def etag(stat):
+        return '"%x-%x"' % (stat.st_mtime_ns, stat.st_size)
+
+    # --- Methoden --------------------------------------------------------
+
+    def do_PUT(self):
+        self.count()
+        path = self.local_path()
+        if path is None or not os.path.isdir(os.path.dirname(path)):
+            self.discard_body()
+            return self.reply(409)
+        existed = os.path.exists(path)
+        with open(path, 'wb') as f:
+            for data in self.iter_body():
+                f.write(data)
+        self.reply(204 if existed else 201, headers={'ETag': self.etag(os.stat(path))})
+
+    def do_MKCOL(self):
+        self.count()
+        self.discard_body()
+        path = self.local_path()
+        if path is None:
+            return self.reply(404)
+        if os.path.exists(path):
+            return self.reply(405)
+        if os.sep + '.uploads' + os.sep in path:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        if not os.path.isdir(os.path.dirname(path)):
+            return self.reply(409)
+        os.mkdir(path)
+        self.reply(201)
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        self.count()
+        if urlparse(self.path).path.startswith('/ocs/'):
+            capabilities = {'dav': {'bulkupload': '1.0'}} if self.server.bulk else {'dav': {}}
+            data = json.dumps({'ocs': {'data': {'capabilities': capabilities}}}).encode()
+            return self.reply(200, data, {'Content-Type': 'application/json'})
+        path = self.local_path()
+        if path is None or not os.path.isfile(path):
+            return self.reply(404)
+        stat = os.stat(path)
+        size = stat.st_size
+        start, end, status = 0, size - 1, 200
+        match = re.match(r'bytes=(\d*)-(\d*)$', self.headers.get('Range', ''))
+        if match and (match.group(1) or match.group(2)):
+            if match.group(1):
+                start = int(match.group(1))
+                end = min(int(match.group(2)), size - 1) if match.group(2) else size - 1
+            else:
+                start = max(0, size - int(match.group(2)))
+            if start > end:
+                return self.reply(416, headers={'Content-Range': f'bytes */{size}'})
+            status = 206
+        self.send_response(status)
+        self.send_header('Content-Length', str(end - start + 1))
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('ETag', self.etag(stat))
+        if status == 206:
+            self.send_header('Content-Range', f'bytes {start}-{end}/{size}')
+        self.end_headers()
+        if self.command == 'HEAD':
+            return
+        with open(path, 'rb') as f:
+            f.seek(start)
+            remaining = end - start + 1
+            while remaining:
+                data = f.read(min(remaining, BLOCK_SIZE))
+                if not data:
+                    break
+                self.server.throttle.consume(len(data))
+                self.wfile.write(data)
+                remaining -= len(data)
+
+    def do_DELETE(self):
+        self.count()
+        path = self.local_path()
+        if path is None or not os.path.exists(path):
+            return self.reply(404)
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
+        self.reply(204)
+
+    def do_MOVE(self):
+        self.count()
+        source = self.local_path()
+        target = self.local_path(self.headers.get('Destination', ''))
+        if source is None or target is None:
+            return self.reply(400)
+        if os.path.basename(source) == '.file':
+            # Chunked Upload: Chunks in Namensreihenfolge zusammensetzen
+            folder = os.path.dirname(source)
+            if not os.path.isdir(folder):
+                return self.reply(404)
+            with open(target, 'wb') as out:
+                for name in sorted(os.listdir(folder)):
+                    with open(os.path.join(folder, name), 'rb') as f:
+                        shutil.copyfileobj(f, out, BLOCK_SIZE)
+            shutil.rmtree(folder)
+            return self.reply(201)
+        if not os.path.exists(source):
+            return self.reply(404)
+        existed = os.path.exists(target)
+        shutil.move(source, target)
+        self.reply(204 if existed else 201)
+
+    def do_POST(self):
+        # Nextcloud Bulk-Upload: multipart/related, je Teil X-File-Path, X-File-MD5, Content-Length
+        self.count()
+        match = re.search(r'boundary="?([^";]+)"?', self.headers.get('Content-Type', ''))
+        if not self.server.bulk or urlparse(self.path).path != '/remote.php/dav/bulk' or not match:
+            self.discard_body()
+            return self.reply(404)
+        body = io.BufferedReader(BodyReader(self.iter_body()), BLOCK_SIZE)
+        delimiter = b'--' + match.group(1).encode()
+        written = {}
+        line = body.readline()
+        while line.rstrip(b'\r\n') == delimiter:
+            headers = {}
+            for line in iter(body.readline, b''):
+                if not line.strip():
+                    break
+                key, _, value = line.decode('utf-8').partition(':')
+                headers[key.strip().lower()] = value.strip()
+            remote = headers.get('x-file-path', '')
+            target = os.path.join(self.server.root, *[p for p in remote.split('/') if p])
+            folder_ok = os.path.isdir(os.path.dirname(target))
+            # Inhalt blockweise in eine Temp-Datei, erst nach passender MD5 an den Zielnamen
+            temp = target + '.bulk-upload'
+            md5 = hashlib.md5()
+            remaining = int(headers.get('content-length') or 0)
+            with open(temp if folder_ok else os.devnull, 'wb') as f:
+                while remaining:
+                    data = body.read(min(remaining, BLOCK_SIZE))
+                    if not data:
+                        break
+                    md5.update(data)
+                    f.write(data)
+                    remaining -= len(data)
+            body.readline()
+            line = body.readline()
+            if not folder_ok or remaining or md5.hexdigest() != headers.get('x-file-md5'):
+                if folder_ok:
+                    os.remove(temp)
+                written[remote] = {'error': True, 'message': 'rejected'}
+                continue
+            os.replace(temp, target)
+            written[remote] = {'error': False, 'etag': self.etag(os.stat(target))}
+        while body.read(BLOCK_SIZE):
+            pass
+        self.reply(200, json.dumps(written).encode(), {'Content-Type': 'application/json'})
+
+    def do_PROPFIND(self):
+        self.count()
+        self.discard_body()
+        path = self.local_path()
+        if path is None or not os.path.exists(path):
+            return self.reply(404)
+        # Wie SabreDAV/Nextcloud: ohne Header Depth 1, infinity standardmäßig stillschweigend auf 1 beschränkt
+        # ('clamp'); 'reject' antwortet 403, 'allow' liefert den ganzen Baum
+        depth = self.headers.get('Depth', '1')
+        if depth == 'infinity' and self.server.depth_infinity == 'reject':
+            return self.reply(403)
+        if depth == 'infinity' and self.server.depth_infinity != 'allow':
+            depth = '1'
+        href = unquote(urlparse(self.path).path).rstrip('/')
+        responses = [self.propfind_entry(path, href)]
+        if os.path.isdir(path) and depth != '0':
+            for root, dirs, files in os.walk(path):
+                rel = os.path.relpath(root, path)
+                base = href if rel == '.' else f"{href}/{rel.replace(os.sep, '/')}"
+                for name in sorted(dirs) + sorted(files):
+                    responses.append(self.propfind_entry(os.path.join(root, name), f"{base}/{name}"))
+                if depth == '1':
+                    break
+        data = ('<?xml version="1.0" encoding="utf-8"?><d:multistatus xmlns:d="DAV:">'
+                + ''.join(responses) + '</d:multistatus>').encode('utf-8')
+        self.reply(207, data, {'Content-Type': 'application/xml; charset=utf-8'})
+
+    def propfind_entry(self, path, href):
+        stat = os.stat(path)
+        if os.path.isdir(path):
+            props = '<d:resourcetype><d:collection/></d:resourcetype>'
+            href += '/'
+        else:
+            props = f'<d:resourcetype/><d:getcontentlength>{stat.st_size}</d:getcontentlength>'
+        props += (f'<d:getetag>{self.etag(stat)}</d:getetag>'
+                  f'<d:getlastmodified>{formatdate(stat.st_mtime, usegmt=True)}</d:getlastmodified>')
+        return (f'<d:response><d:href>{escape(quote(href))}</d:href><d:propstat><d:prop>{props}</d:prop>'
+                f'<d:status>HTTP/1.1 200 OK</d:status></d:propstat></d:response>')
+
+
+class WebDAVServer(ThreadingHTTPServer):
+    # WebDAVServer(root, latency=0.02, bandwidth=50 * 1024 * 1024).start() -> Basis-URL für set_credentials
+    daemon_threads = True
+
+    def __init__(self, root, latency=0.0, bandwidth=None, bulk=True, depth_infinity='clamp', port=0):
+        super().__init__(('127.0.0.1', port), WebDAVHandler)
+        self.root = root
+        self.latency = latency
+        self.throttle = Throttle(bandwidth)
+        self.bulk = bulk
+        self.depth_infinity = depth_infinity
+        self.counters = {}
+        self.lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    @property
+    def url(self):
+        return f"http://{self.server_address[0]}:{self.server_address[1]}"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self.url
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def handle_error(self, request, client_address):
+        # Abgebrochene Verbindungen (Cancel, Timeouts) sind im Benchmark kein Fehler des Servers
+        pass
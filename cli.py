@@ -0,0 +1,226 @@
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+from nextcloud_client import NextcloudClient, TransferEngine
+
+# Kommandozeile ohne GUI: einzelne Befehle oder ein Manifest mit vielen Jobs.
+# Ergebnisse gehen als JSON-Zeilen nach stdout, Meldungen des Clients nach stderr.
+
+
+def parse_size(value):
+    # "512M", "2G", "1048576" -> Bytes
+    if value is None or isinstance(value, int):
+        return value
+    units = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+    value = value.strip().upper().rstrip('B').rstrip('I')
+    if value and value[-1] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(value)
+
+
+def run_upload(client, progress, local, remote, parts=1, workers=4, journal=None, part_size=None, compress=None,
+               bulk_threshold=None, dedup=False):
+    if os.path.isdir(local):
+        return client.upload_folder_parallel(local, remote, workers=workers, bulk_threshold=parse_size(bulk_threshold))
+    if dedup:
+        return client.upload_file_dedup(local, remote, workers=workers, progress=progress)
+    if int(parts or 1) > 1 or part_size:
+        return client.upload_file_split(local, remote, parts, workers=workers, journal_path=journal,
+                                        progress=progress, part_size=parse_size(part_size), compression=compress)
+    return client.upload_file_chunked(local, remote, workers=workers, progress=progress, compression=compress)
+
+
+def run_download(client, progress, remote, local, parts=1, workers=4, dedup=False, version=None, cache=None):
+    folder, filename = os.path.split(remote.rstrip('/'))
+    os.makedirs(local, exist_ok=True)
+    if dedup:
+        return client.download_file_dedup(folder, filename, local, version, workers=workers, cache_folder=cache,
+                                          progress=progress)
+    if int(parts) > 1:
+        return client.download_file_parts(folder, filename, local, int(parts), workers=workers, progress=progress)
+    return client.download_file_segmented(folder, filename, local, segments=workers, progress=progress)
+
+
+def run_split(client, progress, local, temp, parts=None, part_size=None):
+    return {'success': True, 'folder': client.split_file(local, temp, parts, parse_size(part_size))}
+
+
+def run_merge(client, progress, local, temp, filename, parts=None):
+    return {'success': client.merge_file_parts(local, temp, filename, parts)}
+
+
+def run_list(client, progress, remote, recursive=False):
+    if recursive:
+        entries = client.list_tree(remote)
+        entries = list(entries.values()) if entries is not None else None
+    else:
+        entries = client.list_folder(remote)
+    return {'success': entries is not None, 'entries': entries or []}
+
+
+def run_sync(client, progress, local, remote, direction='upload', dry_run=False, index=None, workers=4,
+             bulk_threshold=None):
+    return client.sync_folder(local, remote, direction=direction, index_path=index, dry_run=dry_run,
+                              workers=workers, bulk_threshold=parse_size(bulk_threshold))
+
+
+COMMANDS = {
+    'upload': run_upload,
+    'download': run_download,
+    'split': run_split,
+    'merge': run_merge,
+    'list': run_list,
+    'sync': run_sync,
+}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='pyuploader', description='Nextcloud Uploader/Downloader (Kommandozeile)')
+    parser.add_argument('--server', default=os.environ.get('PYUPLOADER_SERVER', ''))
+    parser.add_argument('--user', default=os.environ.get('PYUPLOADER_USER', ''))
+    parser.add_argument('--password', default=os.environ.get('PYUPLOADER_PASSWORD', ''),
+                        help='besser per Umgebungsvariable PYUPLOADER_PASSWORD setzen')
+    parser.add_argument('--webdav-path', default='/remote.php/webdav/')
+    parser.add_argument('--workers', type=int, default=4, help='parallele Verbindungen je Job')
+    parser.add_argument('--jobs', type=int, default=1, help='gleichzeitig laufende Jobs (Manifest)')
+    parser.add_argument('--progress', action='store_true', help='Fortschritt als JSON-Zeilen nach stderr')
+    parser.add_argument('--metrics', action='store_true',
+                        help='am Ende Limit, Retries und Verbindungen als JSON-Zeile nach stderr')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('upload', help='Datei oder Ordner hochladen')
+    p.add_argument('local')
+    p.add_argument('remote', help='Nextcloud-Ordner')
+    p.add_argument('--parts', type=int, default=1)
+    p.add_argument('--part-size', help='Zielgröße je Teil statt Anzahl, z. B. 512M')
+    p.add_argument('--journal', help='Journal-Datei zum Fortsetzen gesplitteter Uploads')
+    p.add_argument('--compress', choices=['gzip', 'lzma'],
+                   help='komprimiert übertragen (nur wenn eine Stichprobe sich packen lässt)')
+    p.add_argument('--bulk-threshold', help='Ordner: Dateien bis zu dieser Größe gebündelt hochladen '
+                                            '(Standard 1M, 0 = aus)')
+    p.add_argument('--dedup', action='store_true',
+                   help='inhaltsdefinierte Chunks, nur fehlende hochladen (Manifest je Version)')
+
+    p = sub.add_parser('download', help='Datei herunterladen (bzw. Teile zusammenführen)')
+    p.add_argument('remote', help='vollständiger Nextcloud-Pfad')
+    p.add_argument('local', help='lokaler Zielordner')
+    p.add_argument('--parts', type=int, default=1)
+    p.add_argument('--dedup', action='store_true', help='aus Manifest und Chunk-Store zusammensetzen')
+    p.add_argument('--version', help='Manifest-Name (Standard: neueste Version)')
+    p.add_argument('--cache', help='lokaler Chunk-Cache')
+
+    p = sub.add_parser('split', help='Datei lokal in Teile splitten')
+    p.add_argument('local')
+    p.add_argument('temp', help='Temp-Ordner')
+    group = p.add_mutually_exclusive_group(required=True)
+    group.add_argument('--parts', type=int)
+    group.add_argument('--part-size', help='Zielgröße je Teil, z. B. 512M')
+
+    p = sub.add_parser('merge', help='lokale Teile zusammenführen')
+    p.add_argument('local', help='Zielordner')
+    p.add_argument('temp', help='Temp-Ordner mit <name>/<name>.partN')
+    p.add_argument('filename')
+    p.add_argument('--parts', type=int, help='Anzahl Teile (Standard: alle vorhandenen)')
+
+    p = sub.add_parser('list', help='Nextcloud-Ordner auflisten')
+    p.add_argument('remote')
+    p.add_argument('--recursive', action='store_true')
+
+    p = sub.add_parser('sync', help='Ordner inkrementell abgleichen')
+    p.add_argument('local')
+    p.add_argument('remote')
+    p.add_argument('--direction', choices=['upload', 'download'], default='upload')
+    p.add_argument('--dry-run', action='store_true')
+    p.add_argument('--index', help='Pfad des Sync-Index (SQLite)')
+    p.add_argument('--bulk-threshold', help='Dateien bis zu dieser Größe gebündelt hochladen (Standard 1M, 0 = aus)')
+
+    p = sub.add_parser('batch', help='Jobs aus einer Manifest-Datei (JSON) ausführen')
+    p.add_argument('manifest')
+    return parser
+
+
+def load_manifest(path):
+    # {"server": ..., "user": ..., "jobs": [{"command": "upload", "local": ..., "remote": ...}, ...]}
+    # oder direkt eine Liste von Jobs
+    with open(path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if isinstance(manifest, list):
+        manifest = {'jobs': manifest}
+    return manifest
+
+
+def job_from_args(args):
+    params = {k: v for k, v in vars(args).items()
+              if k not in ('server', 'user', 'password', 'webdav_path', 'workers', 'jobs', 'progress', 'metrics',
+                           'command')}
+    if args.command in ('upload', 'download', 'sync'):
+        params['workers'] = args.workers
+    return dict(params, command=args.command)
+
+
+def run_jobs(client, jobs, max_jobs=1, workers=4, show_progress=False, out=sys.stdout):
+    # Alle Jobs über einen Client (gemeinsamer Verbindungspool) ausführen; gibt die Anzahl Fehler zurück
+    engine = TransferEngine(max_jobs=max(1, max_jobs))
+    submitted = {}
+    failures = 0
+    for index, job in enumerate(jobs):
+        params = dict(job)
+        command = params.pop('command', None)
+        if command not in COMMANDS:
+            out.write(json.dumps({'job': index, 'command': command, 'state': 'failed',
+                                  'error': f"unbekannter Befehl: {command}"}) + '\n')
+            failures += 1
+            continue
+        if command in ('upload', 'download', 'sync'):
+            params.setdefault('workers', workers)
+        job_id = engine.submit(command, COMMANDS[command], client, **params)
+        submitted[job_id] = (index, command)
+
+    pending = set(submitted)
+    while pending:
+        time.sleep(0.1)
+        for kind, job_id, data in engine.poll():
+            if kind == 'progress' and show_progress:
+                sys.stderr.write(json.dumps({'job': submitted[job_id][0], 'progress': data}) + '\n')
+            if kind == 'state' and data in ('done', 'failed', 'cancelled') and job_id in pending:
+                pending.discard(job_id)
+                state = engine.jobs[job_id]
+                index, command = submitted[job_id]
+                failures += data != 'done'
+                out.write(json.dumps({'job': index, 'command': command, 'state': data,
+                                      'result': state['result'], 'error': state['error']}) + '\n')
+                out.flush()
+    return failures
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    settings = {'server': args.server, 'user': args.user, 'password': args.password,
+                'webdav_path': args.webdav_path}
+    if args.command == 'batch':
+        manifest = load_manifest(args.manifest)
+        for key in settings:
+            if manifest.get(key) and not settings[key]:
+                settings[key] = manifest[key]
+        jobs = manifest.get('jobs', [])
+    else:
+        jobs = [job_from_args(args)]
+
+    client = NextcloudClient(pool_size=max(10, args.workers * max(1, args.jobs)))
+    client.set_credentials(settings['server'], settings['user'], settings['password'], settings['webdav_path'])
+    out = sys.stdout
+    # Statusmeldungen des Clients (print) nicht mit der JSON-Ausgabe mischen
+    with contextlib.redirect_stdout(sys.stderr):
+        failures = run_jobs(client, jobs, args.jobs, args.workers, args.progress, out)
+    if args.metrics:
+        sys.stderr.write(json.dumps({'metrics': client.get_request_metrics(),
+                                     'connections': client.get_connection_stats()}) + '\n')
+    client.close()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,297 @@
+import os
+import time
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+from pathlib import Path
+from nextcloud_client import NextcloudClient, TransferEngine
+
+class App(tk.Tk):
+    def __init__(self):
+        super().__init__()
+        self.title("Nextcloud Uploader/Downloader")
+        self.geometry("500x490")
+        self.client = NextcloudClient()
+        self.engine = TransferEngine(max_jobs=2)
+        self.transfer_messages = {}
+        self.create_widgets()
+        self.after(200, self.poll_transfers)
+
+    def create_widgets(self):
+        #self.tk_set_darkmode()
+        self.notebook = ttk.Notebook(self)
+        self.notebook.pack(fill='both', expand=True)
+        self.upload_frame = ttk.Frame(self.notebook)
+        self.download_frame = ttk.Frame(self.notebook)
+        self.transfers_frame = ttk.Frame(self.notebook)
+        self.settings_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self.upload_frame, text='Upload')
+        self.notebook.add(self.download_frame, text='Download')
+        self.notebook.add(self.transfers_frame, text='Transfers')
+        self.notebook.add(self.settings_frame, text='Settings')
+        self.create_upload_page()
+        self.create_download_page()
+        self.create_transfers_page()
+        self.create_settings_page()
+
+    def tk_set_darkmode(self):
+        style = ttk.Style(self)
+        style.theme_use('clam')
+        style.configure('.', background='#222', foreground='#eee', fieldbackground='#333')
+        style.configure('TLabel', background='#222', foreground='#eee')
+        style.configure('TEntry', fieldbackground='#333', foreground='#eee')
+        style.configure('TButton', background='#444', foreground='#eee')
+        style.configure('TCombobox', fieldbackground='#333', foreground='#eee')
+        style.map('TCombobox', fieldbackground=[('readonly', '#333'), ('!readonly', '#333')], foreground=[('readonly', '#eee'), ('!readonly', '#eee')])
+        style.configure('Treeview', background='#222', foreground='#eee', fieldbackground='#222')
+        style.map('Treeview', background=[('selected', '#444')], foreground=[('selected', '#eee')])
+
+    def create_upload_page(self):
+        self.upload_file_path = tk.StringVar()
+        self.upload_folder = tk.StringVar()
+        self.upload_temp_folder = tk.StringVar()
+        self.upload_parts = tk.IntVar()
+        self.upload_workers = tk.IntVar()
+        self.upload_compression = tk.StringVar()
+        self.upload_temp_folder.set(str(Path.home() / "Downloads" / "temp"))
+        self.upload_parts.set(1)
+        self.upload_workers.set(4)
+        self.upload_compression.set('keine')
+        self.upload_folder.set('/Documents/uploader')
+        upload_container = ttk.Frame(self.upload_frame)
+        upload_container.pack(fill='x', expand=True, padx=10, pady=10)
+        ttk.Label(upload_container, text="Datei auswählen:").grid(row=0, column=0, sticky='w', pady=5)
+        ttk.Entry(upload_container, textvariable=self.upload_file_path, width=40).grid(row=0, column=1, sticky='ew', padx=5)
+        ttk.Button(upload_container, text="Durchsuchen", command=self.select_upload_file).grid(row=0, column=2, padx=5)
+        upload_container.grid_columnconfigure(1, weight=1)
+        ttk.Label(upload_container, text="Temp Ordner:").grid(row=1, column=0, sticky='w', pady=5)
+        ttk.Entry(upload_container, textvariable=self.upload_temp_folder, width=40).grid(row=1, column=1, sticky='ew', padx=5)
+        ttk.Button(upload_container, text="Durchsuchen", command=self.select_upload_temp_dir).grid(row=1, column=2, padx=5)
+        ttk.Label(upload_container, text="Split in:").grid(row=2, column=0, sticky='w', pady=5)
+        ttk.Entry(upload_container, textvariable=self.upload_parts, width=40).grid(row=2, column=1, sticky='ew', padx=5)
+        ttk.Label(upload_container, text="Nextcloud Ordner:").grid(row=3, column=0, sticky='w', pady=5)
+        ttk.Entry(upload_container, textvariable=self.upload_folder, width=40).grid(row=3, column=1, sticky='ew', padx=5)
+        ttk.Label(upload_container, text="Parallele Uploads:").grid(row=4, column=0, sticky='w', pady=5)
+        ttk.Entry(upload_container, textvariable=self.upload_workers, width=40).grid(row=4, column=1, sticky='ew', padx=5)
+        ttk.Label(upload_container, text="Komprimierung:").grid(row=5, column=0, sticky='w', pady=5)
+        ttk.Combobox(upload_container, textvariable=self.upload_compression, values=['keine', 'gzip', 'lzma'],
+                     state='readonly', width=38).grid(row=5, column=1, sticky='ew', padx=5)
+        ttk.Button(upload_container, text="Hochladen", command=self.upload_file).grid(row=6, column=0, columnspan=3, pady=10)
+        ttk.Button(upload_container, text="Just Split", command=self.split_file).grid(row=7, column=0, columnspan=3, pady=10)
+
+    def select_upload_file(self):
+        path = filedialog.askopenfilename()
+        if path:
+            self.upload_file_path.set(path)
+
+    def select_upload_temp_dir(self):
+        path = filedialog.askdirectory()
+        if path:
+            self.upload_temp_folder.set(path)
+
+    def upload_file(self):
+        file_path = self.upload_file_path.get()
+        cloud_folder = self.upload_folder.get()
+        parts = self.upload_parts.get()
+        compression = self.upload_compression.get() if self.upload_compression.get() != 'keine' else None
+        if not file_path or not cloud_folder:
+            messagebox.showerror("Fehler", "Bitte Datei und Ordner angeben.")
+            return
+        name = f"Upload {os.path.basename(file_path)}"
+        if parts > 1:
+            # Journal im Temp-Ordner, damit ein abgebrochener Upload fortgesetzt werden kann
+            journal_path = os.path.join(self.upload_temp_folder.get(), os.path.basename(file_path) + '.upload.journal')
+            job_id = self.engine.submit(name, self.client.upload_file_split, file_path, cloud_folder, parts,
+                                        workers=self.upload_workers.get(), journal_path=journal_path,
+                                        compression=compression)
+        else:
+            job_id = self.engine.submit(name, self.client.upload_file_chunked, file_path, cloud_folder,
+                                        workers=self.upload_workers.get(), compression=compression)
+        self.transfer_messages[job_id] = ("Datei erfolgreich hochgeladen.", "Upload fehlgeschlagen.")
+        self.notebook.select(self.transfers_frame)
+
+    def split_file(self):
+        file_path = self.upload_file_path.get()
+        temp_folder = self.upload_temp_folder.get()
+        parts = self.upload_parts.get()
+        if not file_path:
+            messagebox.showerror("Fehler", "Bitte Datei angeben.")
+            return
+        if parts > 1:
+            job_id = self.engine.submit(f"Split {os.path.basename(file_path)}",
+                                        lambda progress: self.client.split_file(file_path, temp_folder, parts))
+            target = os.path.join(temp_folder, os.path.basename(file_path))
+            self.transfer_messages[job_id] = (f"Datei erfolgreich in {parts} Teile gesplittet im Ordner:\n{target}",
+                                              "Split fehlgeschlagen.")
+            self.notebook.select(self.transfers_frame)
+        else:
+            messagebox.showerror("Fehler", "Anzahl der Teile muss größer als 1 sein.")
+
+    def create_download_page(self):
+        self.download_folder = tk.StringVar()
+        self.download_folder.set(str(Path.home() / "Downloads"))
+        self.download_temp_folder = tk.StringVar()
+        self.download_temp_folder.set(str(Path.home() / "Downloads" / "temp"))
+        self.download_remote_file_folder = tk.StringVar()
+        self.download_remote_file_folder.set('/Documents/uploader')
+        self.download_parts = tk.IntVar()
+        self.download_parts.set(1)
+        self.download_workers = tk.IntVar()
+        self.download_workers.set(4)
+        download_container = ttk.Frame(self.download_frame)
+        download_container.pack(fill='x', expand=True, padx=10, pady=10)
+        ttk.Label(download_container, text="Download Ordner:").grid(row=0, column=0, sticky='w', pady=5)
+        ttk.Entry(download_container, textvariable=self.download_folder, width=40).grid(row=0, column=1, sticky='ew', padx=5)
+        ttk.Button(download_container, text="Durchsuchen", command=self.select_download_folder).grid(row=0, column=2, padx=5)
+        download_container.grid_columnconfigure(1, weight=1)
+        ttk.Label(download_container, text="Temp Ordner:").grid(row=1, column=0, sticky='w', pady=5)
+        ttk.Entry(download_container, textvariable=self.download_temp_folder, width=40).grid(row=1, column=1, sticky='ew', padx=5)
+        ttk.Button(download_container, text="Durchsuchen", command=self.select_download_folder).grid(row=1, column=2, padx=5)
+        ttk.Label(download_container, text="Merge from:").grid(row=2, column=0, sticky='w', pady=5)
+        ttk.Entry(download_container, textvariable=self.download_parts, width=40).grid(row=2, column=1, sticky='ew', padx=5)
+        ttk.Label(download_container, text="Nextcloud Datei:").grid(row=3, column=0, sticky='w', pady=5)
+        ttk.Entry(download_container, textvariable=self.download_remote_file_folder, width=40).grid(row=3, column=1, sticky='ew', padx=5)
+        ttk.Label(download_container, text="Parallele Downloads:").grid(row=4, column=0, sticky='w', pady=5)
+        ttk.Entry(download_container, textvariable=self.download_workers, width=40).grid(row=4, column=1, sticky='ew', padx=5)
+        ttk.Button(download_container, text="Download", command=self.download_file_action).grid(row=5, column=0, columnspan=3, pady=10)
+        ttk.Button(download_container, text="Just Merge", command=self.download_merge_action).grid(row=6, column=0, columnspan=3, pady=10)
+
+    def select_download_folder(self):
+        folder = filedialog.askdirectory()
+        if folder:
+            self.download_folder.set(folder)
+
+    def download_file_action(self):
+        remote_file = self.download_remote_file_folder.get()
+        local_folder = self.download_folder.get()
+        parts = self.download_parts.get()
+        if not remote_file or not local_folder:
+            messagebox.showerror("Fehler", "Bitte Datei und lokalen Ordner angeben.")
+            return
+        # remote_file enthält jetzt den vollständigen Pfad
+        folder, filename = os.path.split(remote_file)
+        if parts > 1:
+            job_id = self.engine.submit(f"Download {filename}", self.client.download_file_parts, folder, filename,
+                                        local_folder, parts, workers=self.download_workers.get())
+        else:
+            job_id = self.engine.submit(f"Download {filename}", self.client.download_file_segmented, folder, filename,
+                                        local_folder, segments=self.download_workers.get())
+        self.transfer_messages[job_id] = ("Datei erfolgreich heruntergeladen.", "Download fehlgeschlagen.")
+        self.notebook.select(self.transfers_frame)
+    
+    def download_merge_action(self):
+        remote_file = self.download_remote_file_folder.get()
+        local_folder = self.download_folder.get()
+        temp_folder = self.download_temp_folder.get()
+        parts = self.download_parts.get()
+        if parts > 1:
+            # Wie Split im Hintergrund, damit große Dateien das Fenster nicht blockieren
+            folder, filename = os.path.split(remote_file)
+            job_id = self.engine.submit(f"Merge {filename}",
+                                        lambda progress: self.client.merge_file_parts(local_folder, temp_folder,
+                                                                                      filename, parts))
+            self.transfer_messages[job_id] = ("Datei erfolgreich gemerget.", "Merge fehlgeschlagen.")
+            self.notebook.select(self.transfers_frame)
+        else:
+            messagebox.showerror("Fehler", "Merge fehlgeschlagen.")
+
+    def create_transfers_page(self):
+        transfers_container = ttk.Frame(self.transfers_frame)
+        transfers_container.pack(fill='both', expand=True, padx=10, pady=10)
+        transfers_container.grid_columnconfigure(0, weight=1)
+        transfers_container.grid_rowconfigure(0, weight=1)
+        columns = ('status', 'progress', 'rate', 'eta', 'parts')
+        self.transfer_tree = ttk.Treeview(transfers_container, columns=columns, height=10)
+        self.transfer_tree.heading('#0', text='Job')
+        self.transfer_tree.heading('status', text='Status')
+        self.transfer_tree.heading('progress', text='Fortschritt')
+        self.transfer_tree.heading('rate', text='MB/s')
+        self.transfer_tree.heading('eta', text='ETA')
+        self.transfer_tree.heading('parts', text='Teile')
+        self.transfer_tree.column('#0', width=140)
+        for column in columns:
+            self.transfer_tree.column(column, width=70, anchor='center')
+        self.transfer_tree.grid(row=0, column=0, columnspan=3, sticky='nsew')
+        ttk.Button(transfers_container, text="Pause", command=self.pause_transfer).grid(row=1, column=0, pady=10)
+        ttk.Button(transfers_container, text="Fortsetzen", command=self.resume_transfer).grid(row=1, column=1, pady=10)
+        ttk.Button(transfers_container, text="Abbrechen", command=self.cancel_transfer).grid(row=1, column=2, pady=10)
+        self.request_metrics = tk.StringVar()
+        ttk.Label(transfers_container, textvariable=self.request_metrics).grid(row=2, column=0, columnspan=3, sticky='w')
+
+    def selected_transfers(self):
+        return [int(item) for item in self.transfer_tree.selection()]
+
+    def pause_transfer(self):
+        for job_id in self.selected_transfers():
+            self.engine.pause(job_id)
+
+    def resume_transfer(self):
+        for job_id in self.selected_transfers():
+            self.engine.resume(job_id)
+
+    def cancel_transfer(self):
+        for job_id in self.selected_transfers():
+            self.engine.cancel(job_id)
+
+    def poll_transfers(self):
+        # Events der Transfer-Threads im Tk-Thread verarbeiten
+        for kind, job_id, data in self.engine.poll():
+            item = str(job_id)
+            if not self.transfer_tree.exists(item):
+                self.transfer_tree.insert('', 'end', iid=item, text=self.engine.jobs[job_id]['name'],
+                                          values=('', '', '', '', ''))
+            if kind == 'state':
+                self.transfer_tree.set(item, 'status', data)
+                if data in ('done', 'failed', 'cancelled'):
+                    success_msg, error_msg = self.transfer_messages.pop(job_id, (None, None))
+                    if data == 'done' and success_msg:
+                        messagebox.showinfo("Erfolg", success_msg)
+                    elif data == 'failed' and error_msg:
+                        messagebox.showerror("Fehler", error_msg)
+                    elif data == 'cancelled' and (success_msg or error_msg):
+                        messagebox.showinfo("Abgebrochen", f"{self.engine.jobs[job_id]['name']} wurde abgebrochen.")
+            else:
+                total = data['total']
+                percent = f"{data['done'] * 100 // total} %" if total else f"{data['done'] // (1024 * 1024)} MB"
+                rate = f"{data['rate'] / (1024 * 1024):.1f}"
+                eta = time.strftime('%H:%M:%S', time.gmtime(data['eta'])) if data['eta'] is not None else ''
+                parts = data['parts']
+                done_parts = parts.get('done', 0) + parts.get('skipped', 0)
+                self.transfer_tree.set(item, 'progress', percent)
+                self.transfer_tree.set(item, 'rate', rate)
+                self.transfer_tree.set(item, 'eta', eta)
+                self.transfer_tree.set(item, 'parts', f"{done_parts}/{sum(parts.values())}" if parts else '')
+        metrics = self.client.get_request_metrics()
+        self.request_metrics.set(f"Verbindungen: {metrics['in_flight']}/{metrics['limit']}  "
+                                 f"Retries: {metrics['retries']}  Fehler: {metrics['errors']}")
+        self.after(200, self.poll_transfers)
+
+    def create_settings_page(self):
+        self.server_entry = tk.StringVar()
+        self.username_entry = tk.StringVar()
+        self.password_entry = tk.StringVar()
+        self.webdav_path_entry = tk.StringVar(value='/remote.php/webdav/')
+        settings_container = ttk.Frame(self.settings_frame)
+        settings_container.pack(fill='both', expand=True, padx=10, pady=10)
+        settings_container.grid_columnconfigure(0, weight=1)
+        settings_container.grid_rowconfigure(0, weight=1)
+        settings_container.grid_rowconfigure(8, weight=1)
+        ttk.Label(settings_container, text="Server Adresse:").grid(row=1, column=0, pady=5)
+        ttk.Entry(settings_container, textvariable=self.server_entry, width=40).grid(row=2, column=0, padx=5)
+        ttk.Label(settings_container, text="Username:").grid(row=3, column=0, pady=5)
+        ttk.Entry(settings_container, textvariable=self.username_entry, width=40).grid(row=4, column=0, padx=5)
+        ttk.Label(settings_container, text="Password:").grid(row=5, column=0, pady=5)
+        ttk.Entry(settings_container, textvariable=self.password_entry, show='*', width=40).grid(row=6, column=0, padx=5)
+        #ttk.Label(self.settings_frame, text="WebDAV Pfad:").pack(pady=5)
+        #ttk.Entry(self.settings_frame, textvariable=self.webdav_path_entry, width=40).pack(pady=5)
+        ttk.Button(settings_container, text="Testen", command=self.test_settings).grid(row=7, column=0, pady=10)
+
+    def test_settings(self):
+        server = self.server_entry.get()
+        username = self.username_entry.get()
+        password = self.password_entry.get()
+        webdav_path = self.webdav_path_entry.get()
+        self.client.set_credentials(server, username, password, webdav_path)
+        if self.client.test_connection():
+            messagebox.showinfo("Erfolg", "Verbindung erfolgreich.")
+        else:
+            messagebox.showerror("Fehler", "Verbindung fehlgeschlagen.")
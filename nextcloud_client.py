@@ -0,0 +1,2260 @@
+import json
+import requests
+from requests.adapters import HTTPAdapter
+import os
+import threading
+import queue
+import time
+from collections import deque
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+import shutil
+import sys
+import sqlite3
+import xml.etree.ElementTree as ET
+from urllib.parse import quote, unquote, urlparse
+import posixpath
+import io
+import hashlib
+import random
+from email.utils import parsedate_to_datetime
+import zlib
+import lzma
+
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+def copy_range(src_fd, dst_fd, src_offset, dst_offset, length):
+    # Kopiert length Bytes zwischen zwei Datei-Deskriptoren mit konstantem Speicherbedarf.
+    # Bevorzugt kernelseitige Kopien (copy_file_range, sendfile), sonst gepuffert über COPY_BUFFER_SIZE.
+    copied = 0
+    if hasattr(os, 'copy_file_range'):
+        try:
+            while copied < length:
+                n = os.copy_file_range(src_fd, dst_fd, min(length - copied, 1 << 30),
+                                       src_offset + copied, dst_offset + copied)
+                if n == 0:
+                    return copied
+                copied += n
+            return copied
+        except OSError:
+            pass
+    if hasattr(os, 'sendfile') and sys.platform.startswith('linux'):
+        try:
+            os.lseek(dst_fd, dst_offset + copied, os.SEEK_SET)
+            while copied < length:
+                n = os.sendfile(dst_fd, src_fd, src_offset + copied, min(length - copied, 1 << 30))
+                if n == 0:
+                    return copied
+                copied += n
+            return copied
+        except OSError:
+            pass
+    os.lseek(src_fd, src_offset + copied, os.SEEK_SET)
+    os.lseek(dst_fd, dst_offset + copied, os.SEEK_SET)
+    while copied < length:
+        chunk = os.read(src_fd, min(length - copied, COPY_BUFFER_SIZE))
+        if not chunk:
+            break
+        view = memoryview(chunk)
+        while view:
+            view = view[os.write(dst_fd, view):]
+        copied += len(chunk)
+    return copied
+
+class FileSlice:
+    # Lesefenster (offset/length) auf eine geöffnete Datei, nutzbar als PUT-Body ohne Temp-Kopie.
+    # Gelesene Bytes werden optional an ein TransferProgress gemeldet, mit digest=True zusätzlich
+    # per SHA-256 gehasht (sha256 ist None, wenn nicht von vorn gelesen wurde).
+    def __init__(self, f, offset, length, progress=None, digest=False):
+        self.f = f
+        self.offset = offset
+        self.length = length
+        self.progress = progress
+        self.digest = digest
+        self.sha256 = hashlib.sha256() if digest else None
+        self.pos = 0
+        self.f.seek(offset)
+
+    def __len__(self):
+        return self.length - self.pos
+
+    def read(self, size=-1):
+        remaining = self.length - self.pos
+        if remaining <= 0:
+            return b''
+        if size is None or size < 0 or size > remaining:
+            size = remaining
+        if self.progress:
+            self.progress.check()
+        data = self.f.read(size)
+        self.pos += len(data)
+        if self.sha256:
+            self.sha256.update(data)
+        if self.progress:
+            self.progress.add(len(data))
+        return data
+
+    def tell(self):
+        return self.pos
+
+    def seek(self, pos, whence=0):
+        if whence == 1:
+            pos += self.pos
+        elif whence == 2:
+            pos += self.length
+        pos = min(max(0, pos), self.length)
+        if self.progress:
+            # Zurückspulen bei Retries: bereits gemeldete Bytes wieder abziehen
+            self.progress.add(pos - self.pos)
+        if self.digest and pos != self.pos:
+            self.sha256 = hashlib.sha256() if pos == 0 else None
+        self.pos = pos
+        self.f.seek(self.offset + self.pos)
+        return self.pos
+
+
+COMPRESSION_CODECS = ('gzip', 'lzma')
+COMPRESSION_META_SUFFIX = '.pyuploader.json'
+COMPRESSION_SAMPLE_SIZE = 256 * 1024
+COMPRESSION_MIN_RATIO = 0.9
+
+
+def _compressor(codec):
+    if codec == 'gzip':
+        return zlib.compressobj(6, zlib.DEFLATED, 31)
+    if codec == 'lzma':
+        return lzma.LZMACompressor(preset=1)
+    raise ValueError(f"unbekannte Komprimierung: {codec}")
+
+
+def iter_decompressed(codec, chunks, max_length=COPY_BUFFER_SIZE):
+    # Entpackt einen Strom komprimierter Blöcke; die Ausgabe je Schritt ist auf max_length begrenzt,
+    # damit stark komprimierte Daten den Speicher nicht aufblähen. Beschädigte Daten -> ValueError.
+    if codec not in COMPRESSION_CODECS:
+        raise ValueError(f"unbekannte Komprimierung: {codec}")
+    try:
+        if codec == 'gzip':
+            d = zlib.decompressobj(31)
+            for chunk in chunks:
+                data = d.decompress(chunk, max_length)
+                while data:
+                    yield data
+                    data = d.decompress(d.unconsumed_tail, max_length) if d.unconsumed_tail else b''
+        else:
+            d = lzma.LZMADecompressor()
+            for chunk in chunks:
+                data = d.decompress(chunk, max_length)
+                while data:
+                    yield data
+                    data = b'' if d.needs_input or d.eof else d.decompress(b'', max_length)
+    except (zlib.error, lzma.LZMAError) as e:
+        raise ValueError(f"komprimierter Datenstrom beschädigt: {e}")
+    if not d.eof:
+        raise ValueError("komprimierter Datenstrom unvollständig")
+
+
+def is_compressible(path, offset=0, length=None, sample_size=COMPRESSION_SAMPLE_SIZE):
+    # Stichprobe (Anfang, Mitte, Ende des Bereichs) schnell mit zlib packen;
+    # bereits komprimierte Inhalte (Videos, Archive, Bilder) werden so nicht ein zweites Mal gepackt.
+    with open(path, 'rb') as f:
+        if length is None:
+            length = os.fstat(f.fileno()).st_size - offset
+        if length <= 0:
+            return False
+        window = min(sample_size, length)
+        sample = b''
+        for start in sorted({0, (length - window) // 2, length - window}):
+            f.seek(offset + start)
+            sample += f.read(window)
+    return len(zlib.compress(sample, 1)) < len(sample) * COMPRESSION_MIN_RATIO
+
+
+class CompressedReader:
+    # Wie FileSlice, aber der Inhalt wird beim Lesen komprimiert (streamender PUT-Body ohne Temp-Datei).
+    # Die Länge ist vorab unbekannt, requests sendet daher mit Transfer-Encoding: chunked.
+    # seek(0) startet die Komprimierung neu, damit Retries von urllib3 den Body zurückspulen können.
+    def __init__(self, f, offset, length, codec, progress=None):
+        self.source = FileSlice(f, offset, length, progress)
+        self.codec = codec
+        self.seek(0)
+
+    def read(self, size=-1):
+        while not self.eof and (size is None or size < 0 or len(self.buffer) < size):
+            data = self.source.read(COPY_BUFFER_SIZE)
+            if data:
+                self.buffer += self.compressor.compress(data)
+            else:
+                self.buffer += self.compressor.flush()
+                self.eof = True
+        if size is None or size < 0:
+            size = len(self.buffer)
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        self.pos += len(data)
+        return data
+
+    def __iter__(self):
+        while True:
+            data = self.read(COPY_BUFFER_SIZE)
+            if not data:
+                return
+            yield data
+
+    def tell(self):
+        return self.pos
+
+    def seek(self, pos, whence=0):
+        if pos != 0 or whence != 0:
+            raise io.UnsupportedOperation("komprimierter Body kann nur an den Anfang gespult werden")
+        self.source.seek(0)
+        self.compressor = _compressor(self.codec)
+        self.buffer = b''
+        self.pos = 0
+        self.eof = False
+        return 0
+
+
+class MultipartBody:
+    # multipart/related-Body für den Nextcloud Bulk-Upload. Die Länge steht vorab fest (Content-Length),
+    # die Dateien werden erst beim Senden blockweise gelesen. seek(0) erlaubt Retries.
+    def __init__(self, files, boundary):
+        # files: Liste von (lokaler Pfad, Part-Header, Größe)
+        self.segments = []
+        for path, headers, size in files:
+            head = f"--{boundary}\r\n" + ''.join(f"{k}: {v}\r\n" for k, v in headers.items()) + "\r\n"
+            self.segments += [head.encode('utf-8'), (path, size), b"\r\n"]
+        self.segments.append(f"--{boundary}--\r\n".encode('utf-8'))
+        self.length = sum(len(s) if isinstance(s, bytes) else s[1] for s in self.segments)
+        self.seek(0)
+
+    def __len__(self):
+        return self.length - self.pos
+
+    def _iter_segments(self):
+        for segment in self.segments:
+            if isinstance(segment, bytes):
+                yield segment
+                continue
+            path, size = segment
+            with open(path, 'rb') as f:
+                remaining = size
+                while remaining:
+                    data = f.read(min(remaining, COPY_BUFFER_SIZE))
+                    if not data:
+                        raise OSError(f"Datei während des Uploads verkürzt: {path}")
+                    remaining -= len(data)
+                    yield data
+
+    def read(self, size=-1):
+        while size is None or size < 0 or len(self.buffer) < size:
+            data = next(self.source, None)
+            if data is None:
+                break
+            self.buffer += data
+        if size is None or size < 0:
+            size = len(self.buffer)
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        self.pos += len(data)
+        return data
+
+    def tell(self):
+        return self.pos
+
+    def seek(self, pos, whence=0):
+        if pos != 0 or whence != 0:
+            raise io.UnsupportedOperation("Multipart-Body kann nur an den Anfang gespult werden")
+        self.source = self._iter_segments()
+        self.buffer = b''
+        self.pos = 0
+        return 0
+
+
+# Gear-Tabelle für das inhaltsdefinierte Chunking; aus SHA-256 abgeleitet, damit Schnittpunkte
+# auf jedem System und in jeder Version gleich bleiben. 30 Bit, damit der Hash ein kleines Python-int bleibt.
+CDC_GEAR = tuple(int.from_bytes(hashlib.sha256(bytes([i])).digest()[:4], 'big') & 0x3FFFFFFF for i in range(256))
+CDC_MASK = 0x3FFFFFFF
+# Dieselben Werte byteweise (niederwertigstes Byte zuerst) für bytes.translate
+CDC_GEAR_BYTES = tuple(bytes((g >> (8 * k)) & 0xFF for g in CDC_GEAR) for k in range(4))
+CDC_BLOCK_SIZE = 64 * 1024
+# Chunk-Liste einer heruntergeladenen Datei, damit sie beim nächsten Download nicht neu zerlegt werden muss
+CDC_INDEX_SUFFIX = '.pyuploader-chunks.json'
+
+
+def _gear_hashes(data):
+    # Gear-Hash aller Positionen auf einmal statt Byte für Byte: h_j = Summe 2^k * gear[data[j-k]] (k < 32)
+    # mod 2^30, also genau h = ((h << 1) + gear[b]) & CDC_MASK ab h = 0 (Terme ab k = 30 fallen weg).
+    # Je Position ein 64-Bit-Feld in einem großen int, aufsummiert in fünf Verdopplungsschritten
+    # (Summen < 2^62, es gibt keinen Übertrag ins nächste Feld). Liefert 8 Bytes je Position, little endian.
+    n = len(data)
+    fields = bytearray(8 * n)
+    for k, table in enumerate(CDC_GEAR_BYTES):
+        fields[k::8] = data.translate(table)
+    h = int.from_bytes(fields, 'little')
+    for m in (1, 2, 4, 8, 16):
+        h += h << (64 * m + m)
+    return (h & ((1 << (64 * n)) - 1)).to_bytes(8 * n, 'little')
+
+
+def _cdc_cut(buf, start, end, limit):
+    # Erste Schnittstelle in buf[start:end] (Hash beginnt bei start mit 0), sonst None.
+    # Blockweise, damit ein früher Treffer nicht das ganze Fenster kostet. Kandidaten sucht find() in einem
+    # Byte der Hashes, das dafür null sein muss; nur diese werden in Python genau geprüft.
+    if limit <= 1 << 16:
+        lane, table = 2, None
+    else:
+        shift = max(0, limit.bit_length() - 1 - 24)
+        lane, table = 3, bytes(0 if (b & 0x3F) >> shift == 0 else 1 for b in range(256))
+    for pos in range(start, end, CDC_BLOCK_SIZE):
+        # 31 Bytes Vorlauf: der Hash hängt nur von den letzten 32 Bytes ab
+        lo = max(start, pos - 31)
+        hashes = _gear_hashes(buf[lo:min(end, pos + CDC_BLOCK_SIZE)])
+        lanes = hashes[lane::8]
+        if table:
+            lanes = lanes.translate(table)
+        j = lanes.find(0, pos - lo)
+        while j != -1:
+            if int.from_bytes(hashes[8 * j:8 * j + 4], 'little') & CDC_MASK < limit:
+                return lo + j + 1
+            j = lanes.find(0, j + 1)
+    return None
+
+
+def iter_cdc_chunks(f, min_size, avg_size, max_size):
+    # Inhaltsdefiniertes Chunking (Gear-Rolling-Hash wie FastCDC): geschnitten wird, wo die oberen Bits
+    # des Hashes null sind. Eine Einfügung verschiebt so nur die Grenzen in ihrer Nähe, nicht alle folgenden.
+    # Liefert (offset, daten); der Speicherbedarf bleibt bei etwa 2 * max_size.
+    limit = 1 << (30 - max(1, (avg_size - min_size).bit_length() - 1))
+    buf = b''
+    base = 0
+    eof = False
+    while True:
+        while not eof and len(buf) < max_size:
+            data = f.read(max_size)
+            eof = not data
+            buf += data
+        if not buf:
+            return
+        end = min(len(buf), max_size)
+        cut = (_cdc_cut(buf, min_size, end, limit) if end > min_size else None) or end
+        yield base, buf[:cut]
+        buf = buf[cut:]
+        base += cut
+
+class TransferJournal:
+    # Kleines JSON-Journal für fortsetzbare Übertragungen: Quelle, Teilgrenzen und bestätigte Teile
+    def __init__(self, path):
+        self.path = path
+        self.data = None
+        self._lock = threading.Lock()
+
+    def load(self, **expected):
+        # Nur übernehmen, wenn Quelle (Größe/mtime bzw. ETags) und Teilgrenzen unverändert sind
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if not isinstance(data, dict) or any(data.get(k) != v for k, v in expected.items()):
+            return False
+        data.setdefault('confirmed', {})
+        self.data = data
+        return True
+
+    def start(self, **info):
+        self.data = dict(info, confirmed={})
+        self.save()
+
+    def confirmed(self, name):
+        return self.data['confirmed'].get(name)
+
+    def confirm(self, name, **info):
+        with self._lock:
+            self.data['confirmed'][name] = info
+            self.save()
+
+    def save(self):
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f)
+        os.replace(tmp_path, self.path)
+
+    def remove(self):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+class SyncIndex:
+    # SQLite-Index des zuletzt synchronisierten Zustands je Datei (remote Größe/ETag/mtime, lokal Größe/mtime)
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('CREATE TABLE IF NOT EXISTS files ('
+                          'root TEXT, path TEXT, remote_size INTEGER, remote_etag TEXT, remote_mtime TEXT, '
+                          'local_size INTEGER, local_mtime REAL, PRIMARY KEY (root, path))')
+        self.conn.commit()
+
+    def load(self, root):
+        rows = self.conn.execute('SELECT path, remote_size, remote_etag, remote_mtime, local_size, local_mtime '
+                                 'FROM files WHERE root = ?', (root,))
+        return {r[0]: {'remote_size': r[1], 'remote_etag': r[2], 'remote_mtime': r[3],
+                       'local_size': r[4], 'local_mtime': r[5]} for r in rows}
+
+    def update(self, root, rows):
+        self.conn.executemany('INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)',
+                              [(root, path, r['remote_size'], r['remote_etag'], r['remote_mtime'],
+                                r['local_size'], r['local_mtime']) for path, r in rows.items()])
+        self.conn.commit()
+
+    def remove(self, root, paths):
+        self.conn.executemany('DELETE FROM files WHERE root = ? AND path = ?', [(root, p) for p in paths])
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+class TransferCancelled(Exception):
+    pass
+
+
+class TransferProgress:
+    # Fortschritt eines Jobs (Bytes, Teile) plus Pause/Abbruch; wird aus den Worker-Threads aktualisiert
+    def __init__(self, job_id, events=None, interval=0.25):
+        self.job_id = job_id
+        self.events = events
+        self.interval = interval
+        self.total = 0
+        self.done = 0
+        self.parts = {}
+        self.samples = deque(maxlen=50)
+        self.last_event = 0
+        self.cancelled = threading.Event()
+        self.running = threading.Event()
+        self.running.set()
+        self._lock = threading.Lock()
+
+    def set_total(self, total):
+        with self._lock:
+            self.total = total
+        self._post(force=True)
+
+    def add(self, n):
+        with self._lock:
+            self.done += n
+        self._post()
+
+    def part(self, name, state):
+        with self._lock:
+            self.parts[name] = state
+        self._post(force=state != 'running')
+
+    def check(self):
+        # Wird regelmäßig aus den Transfer-Schleifen aufgerufen: blockiert bei Pause, bricht bei Abbruch ab
+        if self.cancelled.is_set():
+            raise TransferCancelled()
+        if not self.running.is_set():
+            # Während der Pause keine Request-Slots belegen, sonst stehen alle anderen Jobs still
+            suspended = RequestScheduler.suspend_thread()
+            try:
+                self.running.wait()
+            finally:
+                RequestScheduler.resume_thread(suspended)
+        if self.cancelled.is_set():
+            raise TransferCancelled()
+
+    def pause(self):
+        self.running.clear()
+
+    def resume(self):
+        self.running.set()
+
+    def cancel(self):
+        self.cancelled.set()
+        self.running.set()
+
+    def snapshot(self):
+        now = time.monotonic()
+        with self._lock:
+            self.samples.append((now, self.done))
+            # Rate über die letzten ~5 Sekunden
+            while len(self.samples) > 2 and now - self.samples[0][0] > 5:
+                self.samples.popleft()
+            t0, d0 = self.samples[0]
+            rate = (self.done - d0) / (now - t0) if now > t0 else 0.0
+            states = {}
+            for state in self.parts.values():
+                states[state] = states.get(state, 0) + 1
+            remaining = max(0, self.total - self.done)
+            return {'job': self.job_id, 'done': self.done, 'total': self.total,
+                    'rate': rate, 'eta': remaining / rate if rate > 0 else None,
+                    'parts': states, 'paused': not self.running.is_set()}
+
+    def _post(self, force=False):
+        if self.events is None:
+            return
+        now = time.monotonic()
+        if force or now - self.last_event >= self.interval:
+            self.last_event = now
+            self.events.put(('progress', self.job_id, self.snapshot()))
+
+
+class TransferEngine:
+    # Führt Transfer-Jobs außerhalb des Tk-Threads aus. Jobs laufen aus einer Warteschlange,
+    # höchstens max_jobs gleichzeitig; Zustände und Fortschritt gehen als Events an events.
+    def __init__(self, max_jobs=2):
+        self.max_jobs = max_jobs
+        self.jobs = {}
+        self.events = queue.Queue()
+        self._queue = queue.Queue()
+        self._threads = []
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def submit(self, name, func, *args, **kwargs):
+        # func wird mit progress=<TransferProgress> aufgerufen und liefert ein Report-Dict oder bool
+        with self._lock:
+            job_id = self._next_id
+            self._next_id += 1
+            progress = TransferProgress(job_id, self.events)
+            self.jobs[job_id] = {'id': job_id, 'name': name, 'state': 'queued', 'progress': progress,
+                                 'result': None, 'error': None}
+            if len(self._threads) < self.max_jobs:
+                thread = threading.Thread(target=self._run, daemon=True)
+                self._threads.append(thread)
+                thread.start()
+        self.events.put(('state', job_id, 'queued'))
+        self._queue.put((job_id, func, args, kwargs))
+        return job_id
+
+    def cancel(self, job_id):
+        self.jobs[job_id]['progress'].cancel()
+
+    def pause(self, job_id):
+        self.jobs[job_id]['progress'].pause()
+        self.events.put(('state', job_id, 'paused'))
+
+    def resume(self, job_id):
+        self.jobs[job_id]['progress'].resume()
+        if self.jobs[job_id]['state'] == 'running':
+            self.events.put(('state', job_id, 'running'))
+
+    def poll(self):
+        # Alle anstehenden Events abholen (für Tk: aus after() aufrufen)
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def _run(self):
+        while True:
+            job_id, func, args, kwargs = self._queue.get()
+            job = self.jobs[job_id]
+            progress = job['progress']
+            if progress.cancelled.is_set():
+                self._set_state(job, 'cancelled')
+                continue
+            self._set_state(job, 'running')
+            try:
+                result = func(*args, progress=progress, **kwargs)
+                job['result'] = result
+                success = result.get('success') if isinstance(result, dict) else bool(result)
+                self._set_state(job, 'done' if success else 'failed')
+            except TransferCancelled:
+                self._set_state(job, 'cancelled')
+            except Exception as e:
+                job['error'] = str(e)
+                self._set_state(job, 'failed')
+
+    def _set_state(self, job, state):
+        job['state'] = state
+        self.events.put(('state', job['id'], state))
+        self.events.put(('progress', job['id'], job['progress'].snapshot()))
+
+
+class RequestScheduler:
+    # Gemeinsame Steuerung aller Requests eines Clients:
+    # - begrenzt die gleichzeitig laufenden Requests; das Limit wächst additiv, solange es ausgeschöpft wird
+    #   und die Latenz nahe am Minimum bleibt, und halbiert sich bei Fehlern, 429/503 oder stark steigender Latenz
+    # - Wartezeit vor Retries: exponentiell mit Jitter, mindestens Retry-After des Servers
+    # Ein Thread, der schon einen Slot hält (z. B. in einem gestreamten Listing), wartet nicht erneut.
+    RETRY_STATUSES = (429, 502, 503, 504)
+    IDEMPOTENT_METHODS = ('GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS', 'PROPFIND', 'MKCOL')
+    # Scheduler, in denen der aktuelle Thread Slots hält (für suspend_thread)
+    _thread = threading.local()
+
+    def __init__(self, limit=4, min_limit=1, max_limit=16, max_retries=3, backoff_base=0.5, backoff_max=30.0,
+                 retry_after_max=300.0, latency_tolerance=2.0):
+        self.limit = float(max(min_limit, min(limit, max_limit)))
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_after_max = retry_after_max
+        self.latency_tolerance = latency_tolerance
+        self.in_flight = 0
+        self.latency = None
+        self.min_latency = None
+        self.counters = {'requests': 0, 'retries': 0, 'errors': 0, 'timeouts': 0, 'throttled': 0,
+                         'increases': 0, 'decreases': 0, 'max_in_flight': 0, 'backoff_seconds': 0.0}
+        self.latency_window = 60.0
+        self._window_start = time.monotonic()
+        self._window_min = None
+        self._last_decrease = 0.0
+        self._held = threading.local()
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        held = getattr(self._held, 'count', 0)
+        with self._cond:
+            while not held and self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+            self.counters['max_in_flight'] = max(self.counters['max_in_flight'], self.in_flight)
+        self._held.count = held + 1
+        if not held:
+            if not hasattr(self._thread, 'schedulers'):
+                self._thread.schedulers = set()
+            self._thread.schedulers.add(self)
+
+    def release(self):
+        self._held.count = getattr(self._held, 'count', 1) - 1
+        if self._held.count <= 0:
+            getattr(self._thread, 'schedulers', set()).discard(self)
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify()
+
+    def suspend(self):
+        # Slots des aktuellen Threads freigeben, ohne dass sein Request endet; resume(held) belegt sie wieder
+        held = getattr(self._held, 'count', 0)
+        if held:
+            self._held.count = 0
+            with self._cond:
+                self.in_flight -= held
+                self._cond.notify_all()
+        return held
+
+    def resume(self, held):
+        if not held:
+            return
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += held
+        self._held.count = held
+
+    @classmethod
+    def suspend_thread(cls):
+        # Alle Slots des aktuellen Threads freigeben (z. B. solange ein Job mitten im Request pausiert)
+        return [(scheduler, scheduler.suspend()) for scheduler in list(getattr(cls._thread, 'schedulers', ()))]
+
+    @staticmethod
+    def resume_thread(suspended):
+        for scheduler, held in suspended:
+            scheduler.resume(held)
+
+    def on_success(self, latency=None):
+        # latency nur für Requests ohne großen Body, sonst misst sie die Bandbreite statt des Servers
+        with self._cond:
+            self.counters['requests'] += 1
+            if latency is not None:
+                self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+                # Minimum je Zeitfenster, damit ein einzelner Ausreißer nach unten nicht ewig gilt
+                now = time.monotonic()
+                if now - self._window_start > self.latency_window:
+                    self.min_latency = self._window_min
+                    self._window_start, self._window_min = now, latency
+                self._window_min = min(latency, self._window_min or latency)
+                self.min_latency = min(latency, self.min_latency or latency)
+                if self.latency > 0.05 and self.latency > self.latency_tolerance * self.min_latency:
+                    self._decrease()
+                    return
+                if self.latency > 0.05 and self.latency > 1.25 * self.min_latency:
+                    # Latenz steigt bereits: Limit halten
+                    return
+            if self.in_flight >= int(self.limit) and self.limit < self.max_limit:
+                self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+                self.counters['increases'] += 1
+                self._cond.notify_all()
+
+    def on_error(self, kind):
+        # kind: 'timeout', 'connection', 'throttled' (429/503) oder 'server' (502/504)
+        with self._cond:
+            self.counters['requests'] += 1
+            self.counters['errors'] += 1
+            if kind == 'timeout':
+                self.counters['timeouts'] += 1
+            elif kind == 'throttled':
+                self.counters['throttled'] += 1
+            self._decrease()
+
+    def _decrease(self):
+        # Höchstens einmal je Latenzfenster halbieren, damit gleichzeitige Fehler das Limit nicht auf 1 drücken
+        now = time.monotonic()
+        if now - self._last_decrease < max(self.latency or 0.0, 0.1):
+            return
+        self._last_decrease = now
+        self.limit = max(float(self.min_limit), self.limit / 2)
+        self.counters['decreases'] += 1
+
+    def backoff(self, attempt, retry_after=None):
+        # Full Jitter: zufällig zwischen 0 und base * 2^attempt (gedeckelt), Retry-After hat Vorrang
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.retry_after_max))
+        with self._cond:
+            self.counters['retries'] += 1
+            self.counters['backoff_seconds'] += delay
+        return delay
+
+    @staticmethod
+    def parse_retry_after(value):
+        # Sekunden oder HTTP-Datum; None wenn nicht lesbar
+        if not value:
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError, IndexError, OverflowError):
+            return None
+
+    def metrics(self):
+        with self._cond:
+            metrics = dict(self.counters)
+            metrics.update({'limit': int(self.limit), 'in_flight': self.in_flight,
+                            'latency_ms': round(self.latency * 1000, 1) if self.latency is not None else None,
+                            'min_latency_ms': round(self.min_latency * 1000, 1) if self.min_latency is not None else None})
+            metrics['backoff_seconds'] = round(metrics['backoff_seconds'], 3)
+        return metrics
+
+
+class RequestStats:
+    # Request-Hook, der Zeit, Bytes und Retries je Methode sammelt (client.add_request_hook(stats)).
+    # summary() lässt sich als JSON speichern und zwischen zwei Ständen vergleichen.
+    def __init__(self, keep_records=False):
+        self.keep_records = keep_records
+        self.records = []
+        self._seconds = []
+        self._totals = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, record):
+        with self._lock:
+            totals = self._totals.setdefault(record['method'], {'requests': 0, 'retries': 0, 'errors': 0,
+                                                                'seconds': 0.0, 'bytes_sent': 0,
+                                                                'bytes_received': 0})
+            totals['requests'] += 1
+            totals['retries'] += record['retry']
+            totals['errors'] += bool(record['error']) or record['status'] >= 400
+            totals['seconds'] += record['seconds']
+            totals['bytes_sent'] += record['bytes_sent'] or 0
+            totals['bytes_received'] += record['bytes_received'] or 0
+            self._seconds.append(record['seconds'])
+            if self.keep_records:
+                self.records.append(record)
+
+    def summary(self):
+        with self._lock:
+            by_method = {method: dict(totals, seconds=round(totals['seconds'], 4))
+                         for method, totals in sorted(self._totals.items())}
+            seconds = sorted(self._seconds)
+        summary = {key: sum(t[key] for t in by_method.values())
+                   for key in ('requests', 'retries', 'errors', 'bytes_sent', 'bytes_received')}
+        summary['latency_p50_ms'] = round(seconds[len(seconds) // 2] * 1000, 2) if seconds else None
+        summary['latency_p95_ms'] = round(seconds[int(len(seconds) * 0.95)] * 1000, 2) if seconds else None
+        summary['by_method'] = by_method
+        return summary
+
+    def reset(self):
+        with self._lock:
+            self.records = []
+            self._seconds = []
+            self._totals = {}
+
+
+class NextcloudClient:
+    def __init__(self, pool_size=10, keep_alive=True, connect_timeout=10, read_timeout=300, max_retries=3):
+        self.server = ''
+        self.username = ''
+        self.password = ''
+        self.webdav_path = '/remote.php/webdav/'
+        # Transport-Einstellungen für die gepoolte Session
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        # Chunked Upload (Nextcloud uploads/ + MOVE)
+        self.chunk_size = 10 * 1024 * 1024
+        self.chunk_workers = 4
+        # Puffergröße für gestreamte Downloads
+        self.download_buffer_size = 1024 * 1024
+        # Segmentierter Download: kleinere Segmente lohnen den zusätzlichen Request nicht
+        self.min_segment_size = 8 * 1024 * 1024
+        # Listing: Depth infinity erlaubt? (None = noch nicht bekannt)
+        self.depth_infinity = None
+        # Bulk-Upload kleiner Dateien (Nextcloud /remote.php/dav/bulk); None = noch nicht bekannt
+        self.bulk_upload = None
+        self.bulk_threshold = 1024 * 1024
+        self.bulk_max_files = 100
+        self.bulk_max_bytes = 16 * 1024 * 1024
+        # Dedup-Upload: inhaltsdefinierte Chunks (Mindest-, Durchschnitts-, Maximalgröße)
+        self.cdc_min_size = 512 * 1024
+        self.cdc_avg_size = 1024 * 1024
+        self.cdc_max_size = 4 * 1024 * 1024
+        # Rohe PROPFIND-Antworten nur auf Wunsch und begrenzt mitschneiden
+        self.debug_capture = False
+        self.debug_capture_limit = 256 * 1024
+        # Gemeinsame Steuerung für alle Requests: Limit gleichzeitiger Requests (AIMD) und Retries
+        self.scheduler = RequestScheduler(limit=min(4, pool_size), max_limit=pool_size, max_retries=max_retries)
+        # Instrumentierung: Callbacks je Request-Versuch (siehe add_request_hook, RequestStats)
+        self.request_hooks = []
+        self.session = None
+        self._session_lock = threading.Lock()
+
+    def set_credentials(self, server, username, password, webdav_path=None):
+        self.server = server.rstrip('/')
+        self.username = username
+        self.password = password
+        if webdav_path:
+            self.webdav_path = webdav_path
+        # Neue Zugangsdaten -> neue Session, alte Verbindungen schließen
+        with self._session_lock:
+            if self.session is not None:
+                self.session.close()
+            self.session = self._create_session()
+
+    def _create_session(self):
+        session = requests.Session()
+        session.auth = (self.username, self.password)
+        # Retries übernimmt der RequestScheduler in _request (Backoff, Retry-After, Limit)
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        if not self.keep_alive:
+            session.headers['Connection'] = 'close'
+        return session
+
+    def _get_session(self):
+        with self._session_lock:
+            if self.session is None:
+                self.session = self._create_session()
+            return self.session
+
+    def _request(self, method, url, **kwargs):
+        # Alle WebDAV-Aufrufe laufen über die gemeinsame Session (Keep-Alive, Pool, Timeouts) und den Scheduler.
+        # Wiederholt werden Verbindungsfehler, Timeouts und 429/502/503/504, sofern die Methode idempotent ist
+        # und sich der Body zurückspulen lässt (429 und Connect-Timeouts auch sonst: der Request kam nie an).
+        kwargs.setdefault('timeout', (self.connect_timeout, self.read_timeout))
+        scheduler = self.scheduler
+        body = kwargs.get('data')
+        idempotent = method in scheduler.IDEMPOTENT_METHODS
+        # Latenz nur ohne großen Body werten (sonst misst sie die Bandbreite)
+        measure = body is None or hasattr(body, '__len__') and len(body) < 256 * 1024
+        attempt = 0
+        while True:
+            scheduler.acquire()
+            start = time.monotonic()
+            retry_after = None
+            try:
+                r = self._get_session().request(method, url, **kwargs)
+            except requests.RequestException as e:
+                scheduler.release()
+                scheduler.on_error('timeout' if isinstance(e, requests.Timeout) else 'connection')
+                retry = (attempt < scheduler.max_retries and (idempotent or isinstance(e, requests.ConnectTimeout))
+                         and self._rewind(body))
+                self._emit(method, url, start, attempt, retry, body, error=type(e).__name__)
+                if not retry:
+                    raise
+            except BaseException:
+                # z. B. TransferCancelled aus dem Body: Slot freigeben, nicht wiederholen
+                scheduler.release()
+                raise
+            else:
+                if r.status_code not in scheduler.RETRY_STATUSES:
+                    scheduler.on_success(time.monotonic() - start if measure else None)
+                    return self._hold_slot(r, kwargs.get('stream'), (method, url, start, attempt, False, body))
+                scheduler.on_error('throttled' if r.status_code in [429, 503] else 'server')
+                if (attempt >= scheduler.max_retries or not (idempotent or r.status_code == 429)
+                        or not self._rewind(body)):
+                    return self._hold_slot(r, kwargs.get('stream'), (method, url, start, attempt, False, body))
+                retry_after = scheduler.parse_retry_after(r.headers.get('Retry-After'))
+                self._emit(method, url, start, attempt, True, body, r, stream=kwargs.get('stream'))
+                r.close()
+                scheduler.release()
+            time.sleep(scheduler.backoff(attempt, retry_after))
+            attempt += 1
+
+    def _hold_slot(self, response, stream, request):
+        # Gestreamte Antworten belegen ihren Slot, bis sie geschlossen werden; erst dann sind Dauer
+        # und empfangene Bytes für die Request-Hooks bekannt.
+        if not stream:
+            self.scheduler.release()
+            self._emit(*request, response=response)
+            return response
+        close = response.close
+        released = []
+
+        def close_and_release():
+            try:
+                close()
+            finally:
+                if not released:
+                    released.append(True)
+                    self.scheduler.release()
+                    self._emit(*request, response=response, stream=True)
+
+        response.close = close_and_release
+        return response
+
+    def add_request_hook(self, hook):
+        # hook(record) wird nach jedem Versuch aufgerufen, record: method, url, status, error, attempt,
+        # retry, seconds (bis zur Antwort bzw. bis zum Schließen gestreamter Antworten), bytes_sent, bytes_received
+        self.request_hooks.append(hook)
+
+    def remove_request_hook(self, hook):
+        self.request_hooks.remove(hook)
+
+    def _emit(self, method, url, start, attempt, retry, body, response=None, error=None, stream=False):
+        if not self.request_hooks:
+            return
+        if body is None:
+            sent = 0
+        elif isinstance(body, (bytes, str)):
+            sent = len(body)
+        else:
+            sent = body.tell() if hasattr(body, 'tell') else None
+        received = 0
+        if response is not None:
+            if not stream:
+                received = len(response.content)
+            elif hasattr(response.raw, 'tell'):
+                received = response.raw.tell()
+        record = {'method': method, 'url': url, 'status': response.status_code if response is not None else 0,
+                  'error': error, 'attempt': attempt, 'retry': retry, 'seconds': time.monotonic() - start,
+                  'bytes_sent': sent, 'bytes_received': received}
+        for hook in list(self.request_hooks):
+            hook(record)
+
+    @staticmethod
+    def _rewind(body):
+        # Body für einen erneuten Versuch an den Anfang; Generatoren lassen sich nicht wiederholen
+        if body is None or isinstance(body, (bytes, str)):
+            return True
+        try:
+            body.seek(0)
+            return True
+        except (AttributeError, OSError):
+            return False
+
+    def get_request_metrics(self):
+        # Aktuelles Limit, laufende Requests, Latenz, Retries und Fehler des Schedulers
+        return self.scheduler.metrics()
+
+    def get_connection_stats(self):
+        # Geöffnete vs. wiederverwendete Verbindungen über alle Pools der Session
+        stats = {'connections_opened': 0, 'requests': 0, 'connections_reused': 0}
+        session = self.session
+        if session is None:
+            return stats
+        for adapter in set(session.adapters.values()):
+            manager = getattr(adapter, 'poolmanager', None)
+            if manager is None:
+                continue
+            for key in list(manager.pools.keys()):
+                pool = manager.pools.get(key)
+                if pool is None:
+                    continue
+                stats['connections_opened'] += pool.num_connections
+                stats['requests'] += pool.num_requests
+        stats['connections_reused'] = max(0, stats['requests'] - stats['connections_opened'])
+        return stats
+
+    def close(self):
+        with self._session_lock:
+            if self.session is not None:
+                self.session.close()
+                self.session = None
+
+    def get_webdav_url(self, folder=""):
+        # Fix: Keine doppelten Slashes, keine führenden/trailing Slashes im folder
+        folder = folder.strip('/')
+        if folder:
+            return f"{self.server}{self.webdav_path.rstrip('/')}/{folder}/"
+        else:
+            return f"{self.server}{self.webdav_path.rstrip('/')}/"
+
+    def get_dav_files_url(self, remote_path):
+        # Neue DAV-API: /remote.php/dav/files/<user>/<pfad> (Ziel für Chunked-Upload MOVE)
+        return f"{self.server}/remote.php/dav/files/{quote(self.username)}/{quote(remote_path.strip('/'))}"
+
+    def get_dav_uploads_url(self, transfer_id):
+        return f"{self.server}/remote.php/dav/uploads/{quote(self.username)}/{transfer_id}"
+
+    def test_connection(self):
+        try:
+            url = self.get_webdav_url()
+            r = self._request('PROPFIND', url)
+            return r.status_code == 207
+        except Exception:
+            return False
+
+    def upload_file(self, local_path, remote_folder, progress=None, compression=None):
+        # Mit compression ('gzip'/'lzma') wird komprimiert übertragen, sofern die Stichprobe sich lohnt;
+        # die Metadaten (<name>.pyuploader.json) daneben erlauben das transparente Entpacken beim Download.
+        size = os.path.getsize(local_path)
+        if progress:
+            progress.set_total(size)
+        codec = compression if compression and is_compressible(local_path) else None
+        status = self._put_file(local_path, remote_folder, progress=progress, codec=codec)
+        if status not in [201, 204]:
+            return False
+        name = os.path.basename(local_path)
+        if codec:
+            return self._put_compression_meta(remote_folder, name, {name: {'codec': codec, 'size': size}})
+        # Evtl. veraltete Metadaten eines früheren, komprimierten Uploads entfernen
+        self._delete_compression_meta(remote_folder, name)
+        return True
+
+    def _put_file(self, local_path, remote_folder, filename=None, offset=0, length=None, url=None, headers=None,
+                  progress=None, codec=None, sent=None, sha256=None):
+        # Gibt den HTTP-Statuscode zurück (0 bei Verbindungsfehlern).
+        # Mit length wird nur das Fenster [offset, offset+length) der Datei gesendet, mit codec komprimiert.
+        # Mit sha256 (nur unkomprimiert) wird der gesendete Inhalt gegengeprüft; bei Abweichung 0.
+        # sent (dict) erhält unter 'bytes' die tatsächlich übertragene Größe und unter 'etag' das ETag der Antwort.
+        filename = filename or os.path.basename(local_path)
+        url = url or f"{self.get_webdav_url(remote_folder)}{filename}"
+        with open(local_path, 'rb') as f:
+            if length is None:
+                length = os.fstat(f.fileno()).st_size - offset
+            if codec:
+                body = CompressedReader(f, offset, length, codec, progress)
+            else:
+                body = FileSlice(f, offset, length, progress, digest=bool(sha256))
+            etag = None
+            try:
+                r = self._request('PUT', url, data=body, headers=headers)
+                status = r.status_code
+                etag = r.headers.get('OC-ETag') or r.headers.get('ETag')
+            except requests.RequestException:
+                status = 0
+            if codec and status in [201, 204] and self._remote_size(url) != body.tell():
+                # Ohne Content-Length geht der Body mit Transfer-Encoding: chunked; manche Setups (nginx + PHP-FPM)
+                # bestätigen das, speichern aber eine leere oder abgeschnittene Datei
+                print(f"Komprimierter Upload unvollständig auf dem Server: {url}")
+                status = 0
+            if (sha256 and not codec and status in [201, 204]
+                    and (body.sha256 is None or body.tell() != length or body.sha256.hexdigest() != sha256)):
+                # Datei hat sich seit dem Hashen geändert: die Daten passen nicht zum Namen im Chunk-Store
+                print(f"Inhalt geändert, Upload verworfen: {url}")
+                try:
+                    self._request('DELETE', url)
+                except requests.RequestException:
+                    pass
+                status = 0
+            if sent is not None:
+                sent['bytes'] = body.tell()
+                sent['etag'] = etag
+            if progress and status not in [201, 204]:
+                # Fehlversuch zählt nicht als Fortschritt
+                progress.add(-(body.source if codec else body).tell())
+        return status
+
+    def _remote_size(self, url):
+        # Depth-0 PROPFIND auf eine Datei; liefert getcontentlength oder None
+        body = ('<?xml version="1.0" encoding="utf-8"?>'
+                '<propfind xmlns="DAV:"><prop><getcontentlength/></prop></propfind>')
+        try:
+            r = self._request('PROPFIND', url, data=body, headers={'Depth': '0'})
+            if r.status_code != 207:
+                return None
+            length = ET.fromstring(r.content).find('.//{DAV:}getcontentlength')
+        except (requests.RequestException, ET.ParseError):
+            return None
+        text = (length.text or '').strip() if length is not None else ''
+        return int(text) if text.isdigit() else None
+
+    def _put_compression_meta(self, remote_folder, name, files):
+        # files: {remote_name: {'codec': ..., 'size': unkomprimierte Größe}}
+        data = json.dumps({'version': 1, 'files': files}).encode('utf-8')
+        url = f"{self.get_webdav_url(remote_folder)}{name}{COMPRESSION_META_SUFFIX}"
+        try:
+            return self._request('PUT', url, data=data).status_code in [201, 204]
+        except requests.RequestException:
+            return False
+
+    def _delete_compression_meta(self, remote_folder, name):
+        try:
+            self._request('DELETE', f"{self.get_webdav_url(remote_folder)}{name}{COMPRESSION_META_SUFFIX}")
+        except requests.RequestException:
+            pass
+
+    def _get_compression_meta(self, remote_folder, name):
+        # Liefert {remote_name: {'codec', 'size'}} oder {} für unkomprimiert abgelegte Dateien
+        url = f"{self.get_webdav_url(remote_folder)}{name}{COMPRESSION_META_SUFFIX}"
+        try:
+            r = self._request('GET', url)
+        except requests.RequestException:
+            return {}
+        if r.status_code != 200:
+            return {}
+        try:
+            return r.json().get('files', {})
+        except ValueError:
+            return {}
+
+    def upload_file_chunked(self, local_path, remote_folder, chunk_size=None, workers=None, retries=2, progress=None,
+                            compression=None):
+        # Nextcloud Chunked Upload: Chunks nach /remote.php/dav/uploads/<user>/<id>/,
+        # danach setzt ein MOVE von .file die Datei serverseitig zusammen.
+        # Komprimierbare Dateien gehen mit compression als ein streamender, komprimierter PUT.
+        chunk_size = int(chunk_size or self.chunk_size)
+        workers = workers or self.chunk_workers
+        filename = os.path.basename(local_path)
+        file_size = os.path.getsize(local_path)
+        remote_path = f"{remote_folder.rstrip('/')}/{filename}"
+        report = {'success': False, 'strategy': 'chunked', 'remote': remote_path, 'chunks': []}
+
+        if compression and is_compressible(local_path):
+            report['strategy'] = 'compressed'
+            report['success'] = self.upload_file(local_path, remote_folder, progress, compression)
+            return report
+        if file_size <= chunk_size:
+            report['strategy'] = 'single'
+            report['success'] = self.upload_file(local_path, remote_folder, progress, compression)
+            return report
+
+        upload_url = self.get_dav_uploads_url(f"pyuploader-{uuid.uuid4().hex}")
+        destination = self.get_dav_files_url(remote_path)
+        headers = {'Destination': destination}
+        try:
+            status = self._request('MKCOL', upload_url, headers=headers).status_code
+        except requests.RequestException:
+            status = 0
+        if status != 201:
+            # Server unterstützt keinen Chunked Upload -> normaler PUT
+            print(f"Chunked Upload nicht verfügbar ({status}), lade als einzelne Datei hoch")
+            report['strategy'] = 'single'
+            report['success'] = self.upload_file(local_path, remote_folder, progress, compression)
+            return report
+
+        headers['OC-Total-Length'] = str(file_size)
+        jobs = []
+        for i, offset in enumerate(range(0, file_size, chunk_size)):
+            # Chunk-Namen 1..N (v2), mit führenden Nullen damit auch v1 richtig sortiert
+            name = f"{i + 1:05d}"
+            jobs.append({'local': local_path, 'remote_dir': remote_path, 'name': name,
+                         'offset': offset, 'length': min(chunk_size, file_size - offset),
+                         'size': min(chunk_size, file_size - offset),
+                         'url': f"{upload_url}/{name}", 'headers': headers})
+        if progress:
+            progress.set_total(file_size)
+        try:
+            report['chunks'] = self._upload_jobs(jobs, workers, retries, progress=progress)
+        except TransferCancelled:
+            # Aufräumen ist best effort: ein Netzwerkfehler darf den Abbruch nicht zu einem Fehler machen
+            try:
+                self._request('DELETE', upload_url)
+            except requests.RequestException:
+                pass
+            raise
+
+        if all(c['success'] for c in report['chunks']):
+            try:
+                r = self._request('MOVE', f"{upload_url}/.file",
+                                  headers={'Destination': destination, 'OC-Total-Length': str(file_size)})
+                report['success'] = r.status_code in [201, 204]
+            except requests.RequestException:
+                pass
+        if report['success']:
+            self._delete_compression_meta(remote_folder, filename)
+        if not report['success']:
+            print(f"Chunked Upload fehlgeschlagen: {remote_path}")
+            try:
+                self._request('DELETE', upload_url)
+            except requests.RequestException:
+                pass
+        return report
+    
+    def upload_folder(self, local_folder, remote_folder):
+        # Ältere Schnittstelle (True/False); kleine Dateien gehen gebündelt, große einzeln
+        return self.upload_folder_parallel(local_folder, remote_folder)['success']
+
+    def upload_folder_parallel(self, local_folder, remote_folder, workers=4, retries=2, bulk_threshold=None):
+        folder_name = os.path.basename(os.path.normpath(local_folder))
+        remote_target_folder = f"{remote_folder.rstrip('/')}/{folder_name}"
+        report = {'success': False, 'folders': [], 'files': []}
+
+        # Alle Ordner und Dateien einsammeln (os.walk liefert Eltern vor Kindern)
+        collections = [remote_target_folder]
+        jobs = []
+        for root, dirs, files in os.walk(local_folder):
+            rel_root = os.path.relpath(root, local_folder)
+            remote_root = remote_target_folder if rel_root == '.' else f"{remote_target_folder}/{rel_root.replace(os.sep, '/')}"
+            for d in sorted(dirs):
+                collections.append(f"{remote_root}/{d}")
+            for file in sorted(files):
+                local_path = os.path.join(root, file)
+                jobs.append({'local': local_path, 'remote_dir': remote_root, 'name': file,
+                             'offset': 0, 'length': None, 'size': os.path.getsize(local_path)})
+
+        if not self._create_collections(collections, report):
+            return report
+        report['files'] = self._upload_batched(jobs, workers, retries, bulk_threshold)
+        report['success'] = all(f['success'] for f in report['files'])
+        return report
+
+    def _upload_batched(self, jobs, workers, retries, threshold=None):
+        # Dateien bis threshold Bytes gebündelt per Bulk-Upload (viele Dateien je Request), der Rest
+        # und alles, was im Bulk fehlschlägt, einzeln per PUT. Ohne Bulk-Endpunkt (reines WebDAV)
+        # laufen alle Dateien als parallele PUTs über die Keep-Alive-Verbindungen.
+        # Ergebnisse in der Reihenfolge von jobs, Format wie _upload_jobs.
+        threshold = self.bulk_threshold if threshold is None else int(threshold)
+        results = [None] * len(jobs)
+        # threshold <= 0 schaltet das Bündeln ab (auch leere Dateien gehen dann einzeln)
+        small = ([i for i, job in enumerate(jobs) if job['size'] <= threshold and not job.get('length')]
+                 if threshold > 0 else [])
+        if len(small) > 1 and self._bulk_upload_supported():
+            batches = [[]]
+            batch_bytes = 0
+            for i in small:
+                if batches[-1] and (len(batches[-1]) >= self.bulk_max_files
+                                    or batch_bytes + jobs[i]['size'] > self.bulk_max_bytes):
+                    batches.append([])
+                    batch_bytes = 0
+                batches[-1].append(i)
+                batch_bytes += jobs[i]['size']
+
+            def upload(batch):
+                attempts, status, written = 0, 0, None
+                while attempts <= retries and written is None and self.bulk_upload:
+                    attempts += 1
+                    status, written = self._bulk_put([jobs[i] for i in batch])
+                    if status in [404, 405, 501]:
+                        print(f"Bulk-Upload nicht verfügbar ({status}), lade einzeln hoch")
+                        self.bulk_upload = False
+                return batch, status, attempts, written or {}
+
+            with ThreadPoolExecutor(max_workers=max(1, int(workers))) as executor:
+                for batch, status, attempts, written in executor.map(upload, batches):
+                    for i in batch:
+                        job = jobs[i]
+                        remote = f"{job['remote_dir']}/{job['name']}"
+                        entry = written.get('/' + remote.strip('/'))
+                        if entry and not entry.get('error'):
+                            results[i] = {'local': job['local'], 'remote': remote, 'offset': 0, 'size': job['size'],
+                                          'success': True, 'status': status, 'attempts': attempts, 'codec': None,
+                                          'bulk': True}
+                            print(f"Hochgeladen: {job['local']} -> {remote}")
+
+        pending = [i for i, result in enumerate(results) if result is None]
+        for i, result in zip(pending, self._upload_jobs([jobs[i] for i in pending], workers, retries)):
+            results[i] = result
+        return results
+
+    def _bulk_upload_supported(self):
+        # Capability dav.bulkupload (Nextcloud >= 23) einmalig abfragen
+        if self.bulk_upload is None:
+            try:
+                r = self._request('GET', f"{self.server}/ocs/v1.php/cloud/capabilities", params={'format': 'json'},
+                                  headers={'OCS-APIRequest': 'true'})
+                capabilities = r.json()['ocs']['data']['capabilities'] if r.status_code == 200 else {}
+                self.bulk_upload = bool(capabilities.get('dav', {}).get('bulkupload'))
+            except (requests.RequestException, ValueError, KeyError, TypeError, AttributeError):
+                self.bulk_upload = False
+        return self.bulk_upload
+
+    def _bulk_put(self, jobs):
+        # Ein POST auf /remote.php/dav/bulk mit allen Dateien als multipart/related.
+        # Gibt (Status, {X-File-Path: {'error': ..., 'etag': ...}}) zurück, bei Fehlern (Status, None).
+        files = []
+        try:
+            for job in jobs:
+                md5 = hashlib.md5()
+                with open(job['local'], 'rb') as f:
+                    size = os.fstat(f.fileno()).st_size
+                    mtime = int(os.fstat(f.fileno()).st_mtime)
+                    for data in iter(lambda: f.read(COPY_BUFFER_SIZE), b''):
+                        md5.update(data)
+                path = '/' + f"{job['remote_dir']}/{job['name']}".strip('/')
+                files.append((job['local'], {'Content-Length': size, 'X-File-Path': path,
+                                             'X-File-MD5': md5.hexdigest(), 'X-File-Mtime': mtime}, size))
+        except OSError:
+            return 0, None
+        boundary = f"pyuploader-{uuid.uuid4().hex}"
+        try:
+            r = self._request('POST', f"{self.server}/remote.php/dav/bulk", data=MultipartBody(files, boundary),
+                              headers={'Content-Type': f'multipart/related; boundary="{boundary}"'})
+        except (requests.RequestException, OSError):
+            return 0, None
+        if r.status_code != 200:
+            return r.status_code, None
+        try:
+            return r.status_code, r.json()
+        except ValueError:
+            return r.status_code, None
+
+    def upload_file_split(self, file_path, remote_folder, parts=None, workers=4, retries=2, journal_path=None,
+                          progress=None, part_size=None, compression=None):
+        # Teile direkt aus Byte-Bereichen der Quelldatei hochladen, ohne Temp-Kopie.
+        # Layout auf dem Server wie bei split_file + upload_folder: <name>/<name>.partN
+        # Mit journal_path werden bestätigte Teile bei einem erneuten Versuch übersprungen.
+        # Mit compression wird jeder Teil einzeln geprüft und ggf. komprimiert; <name>/<name>.pyuploader.json
+        # hält Verfahren und Originalgröße je Teil fest.
+        base_name = os.path.basename(file_path)
+        remote_target_folder = f"{remote_folder.rstrip('/')}/{base_name}"
+        report = {'success': False, 'folders': [], 'files': []}
+        if not self._create_collections([remote_target_folder], report):
+            return report
+
+        ranges = self.part_ranges(os.path.getsize(file_path), parts, part_size)
+        jobs = []
+        for i, (offset, length) in enumerate(ranges):
+            jobs.append({'local': file_path, 'remote_dir': remote_target_folder, 'name': f"{base_name}.part{i}",
+                         'offset': offset, 'length': length, 'size': length,
+                         'codec': compression if compression and is_compressible(file_path, offset, length) else None})
+
+        journal = None
+        if journal_path:
+            journal = TransferJournal(journal_path)
+            stat = os.stat(file_path)
+            expected = {'kind': 'upload', 'source': os.path.abspath(file_path), 'size': stat.st_size,
+                        'mtime': stat.st_mtime, 'remote': remote_target_folder,
+                        'ranges': [list(r) for r in ranges], 'compression': compression}
+            if journal.load(**expected):
+                jobs = self._skip_confirmed_uploads(jobs, journal, remote_target_folder, report)
+            else:
+                journal.start(**expected)
+
+        if progress:
+            progress.set_total(sum(length for _, length in ranges))
+            for skipped in report['files']:
+                progress.add(skipped['size'])
+                progress.part(posixpath.basename(skipped['remote']), 'skipped')
+        report['files'] += self._upload_jobs(jobs, workers, retries, journal, progress)
+        report['success'] = all(f['success'] for f in report['files'])
+        if report['success']:
+            files = {posixpath.basename(f['remote']): {'codec': f['codec'], 'size': f['size']}
+                     for f in report['files'] if f.get('codec')}
+            if files:
+                report['success'] = self._put_compression_meta(remote_target_folder, base_name, files)
+            else:
+                self._delete_compression_meta(remote_target_folder, base_name)
+        if report['success'] and journal:
+            journal.remove()
+        return report
+
+    def _skip_confirmed_uploads(self, jobs, journal, remote_folder, report):
+        # Im Journal bestätigte Teile per PROPFIND (Größe/ETag) gegenprüfen, nur der Rest wird hochgeladen
+        remote = {e['name']: e for e in (self.list_folder(remote_folder) or [])}
+        pending = []
+        for job in jobs:
+            confirmed = journal.confirmed(job['name'])
+            entry = remote.get(job['name'])
+            # Komprimierte Teile: auf dem Server liegt die übertragene, nicht die Originalgröße
+            if (confirmed and entry and entry['size'] == confirmed.get('sent', job['length'])
+                    and confirmed.get('etag') in (None, entry['etag'])):
+                journal.confirm(job['name'], size=job['size'], sent=entry['size'], etag=entry['etag'],
+                                codec=confirmed.get('codec'))
+                report['files'].append({'local': job['local'], 'remote': f"{remote_folder}/{job['name']}",
+                                        'offset': job['offset'], 'size': job['size'], 'success': True,
+                                        'status': 0, 'attempts': 0, 'skipped': True,
+                                        'codec': confirmed.get('codec')})
+            else:
+                pending.append(job)
+        print(f"Fortsetzen: {len(jobs) - len(pending)} von {len(jobs)} Teilen bereits hochgeladen")
+        return pending
+
+    def upload_file_dedup(self, file_path, remote_folder, workers=4, retries=2, progress=None, chunk_store=None):
+        # Datei in inhaltsdefinierte Chunks zerlegen; Chunks liegen nach SHA-256 benannt im Chunk-Store
+        # (<remote_folder>/.pyuploader-chunks/<ab>/<hash>), hochgeladen werden nur fehlende.
+        # Jede Version bekommt ein Manifest <remote_folder>/<name>.versions/<Zeitstempel>.json.
+        base_name = os.path.basename(file_path)
+        store = (chunk_store or f"{remote_folder.rstrip('/')}/.pyuploader-chunks").rstrip('/')
+        versions = f"{remote_folder.rstrip('/')}/{base_name}.versions"
+        report = {'success': False, 'remote': versions, 'manifest': None, 'chunks': 0, 'chunks_uploaded': 0,
+                  'bytes_uploaded': 0, 'bytes_deduplicated': 0, 'folders': [], 'files': []}
+
+        chunks = []
+        file_hash = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            for offset, data in iter_cdc_chunks(f, self.cdc_min_size, self.cdc_avg_size, self.cdc_max_size):
+                if progress:
+                    progress.check()
+                file_hash.update(data)
+                chunks.append((offset, len(data), hashlib.sha256(data).hexdigest()))
+        report['chunks'] = len(chunks)
+        current = os.stat(file_path)
+        if (current.st_size, current.st_mtime_ns) != (stat.st_size, stat.st_mtime_ns):
+            # Manifest und Chunks würden einen halb geschriebenen Stand beschreiben
+            print(f"Datei hat sich beim Zerlegen geändert: {file_path}")
+            return report
+
+        status = self._propfind_status(store)
+        try:
+            existing = ({} if status == 404 else
+                        {posixpath.basename(rel): e['size'] for rel, e in self.iter_tree(store) if not e['is_dir']}
+                        if status == 207 else None)
+        except (requests.RequestException, ET.ParseError):
+            existing = None
+        if existing is None:
+            print(f"Chunk-Store nicht lesbar: {store}")
+            return report
+
+        jobs = {}
+        for offset, length, digest in chunks:
+            if existing.get(digest) == length or digest in jobs:
+                report['bytes_deduplicated'] += length
+            else:
+                jobs[digest] = {'local': file_path, 'remote_dir': f"{store}/{digest[:2]}", 'name': digest,
+                                'offset': offset, 'length': length, 'size': length, 'sha256': digest}
+        collections = [store, versions] + sorted({job['remote_dir'] for job in jobs.values()})
+        if not self._create_collections(collections, report):
+            return report
+        if progress:
+            progress.set_total(sum(job['length'] for job in jobs.values()))
+        print(f"Dedup: {len(jobs)} von {len(chunks)} Chunks fehlen auf dem Server")
+        report['files'] = self._upload_jobs(list(jobs.values()), workers, retries, progress=progress)
+        report['chunks_uploaded'] = sum(1 for f in report['files'] if f['success'])
+        report['bytes_uploaded'] = sum(f['size'] for f in report['files'] if f['success'])
+        if not all(f['success'] for f in report['files']):
+            return report
+
+        manifest = {'version': 1, 'name': base_name, 'size': stat.st_size, 'mtime': stat.st_mtime,
+                    'sha256': file_hash.hexdigest(), 'chunk_store': store,
+                    'chunking': {'min': self.cdc_min_size, 'avg': self.cdc_avg_size, 'max': self.cdc_max_size},
+                    'chunks': [[digest, length] for _, length, digest in chunks]}
+        name = f"{time.strftime('%Y%m%dT%H%M%SZ', time.gmtime())}-{uuid.uuid4().hex[:8]}.json"
+        try:
+            r = self._request('PUT', f"{self.get_webdav_url(versions)}{name}",
+                              data=json.dumps(manifest).encode('utf-8'))
+            report['success'] = r.status_code in [201, 204]
+        except requests.RequestException:
+            pass
+        if report['success']:
+            report['manifest'] = f"{versions}/{name}"
+        return report
+
+    @staticmethod
+    def part_ranges(file_size, parts=None, part_size=None):
+        # (offset, length) je Teil, entweder nach Anzahl (der letzte Teil nimmt den Rest)
+        # oder nach Zielgröße part_size (der letzte Teil ist ggf. kleiner)
+        if part_size:
+            part_size = max(1, int(part_size))
+            ranges = [(offset, min(part_size, file_size - offset)) for offset in range(0, file_size, part_size)]
+            return ranges or [(0, 0)]
+        parts = max(1, int(parts or 1))
+        part_size = file_size // parts
+        ranges = [(i * part_size, part_size) for i in range(parts - 1)]
+        ranges.append(((parts - 1) * part_size, file_size - (parts - 1) * part_size))
+        return ranges
+
+    def _create_collections(self, collections, report):
+        # Ordner einmalig vorab anlegen, sortiert nach Tiefe
+        for folder in sorted(collections, key=lambda p: p.count('/')):
+            print(f"Erstelle Zielordner: {folder}")
+            try:
+                status = self._request("MKCOL", self.get_webdav_url(folder)).status_code
+            except requests.RequestException:
+                status = 0
+            report['folders'].append({'remote': folder, 'status': status})
+            if status not in [201, 405]:
+                print(f"Fehler beim Erstellen des Ordners {folder}: {status}")
+                return False
+        return True
+
+    def _upload_jobs(self, jobs, workers, retries, journal=None, progress=None):
+        def upload(job):
+            if progress:
+                progress.part(job['name'], 'running')
+            result = {'local': job['local'],
+                      'remote': f"{job['remote_dir']}/{job['name']}",
+                      'offset': job['offset'], 'size': job['size'],
+                      'success': False, 'status': 0, 'attempts': 0, 'codec': job.get('codec')}
+            sent = {}
+            # Jede Datei wird einzeln wiederholt, der Rest des Batches läuft weiter
+            while result['attempts'] <= retries and not result['success']:
+                result['attempts'] += 1
+                result['status'] = self._put_file(job['local'], job['remote_dir'], job['name'],
+                                                  job['offset'], job['length'],
+                                                  job.get('url'), job.get('headers'), progress,
+                                                  job.get('codec'), sent, job.get('sha256'))
+                result['success'] = result['status'] in [201, 204]
+            if result['success']:
+                if journal:
+                    journal.confirm(job['name'], size=job['size'], sent=sent.get('bytes', job['length']),
+                                    etag=sent.get('etag'), codec=job.get('codec'))
+                print(f"Hochgeladen: {job['local']} -> {result['remote']}")
+            else:
+                print(f"Fehler beim Hochladen von: {job['local']} -> {result['remote']} ({result['status']})")
+            if progress:
+                progress.part(job['name'], 'done' if result['success'] else 'failed')
+            return result
+
+        with ThreadPoolExecutor(max_workers=max(1, int(workers))) as executor:
+            return list(executor.map(upload, jobs))
+
+    def split_file(self, file_path, temp_folder, parts=None, part_size=None):
+        # Teile nach Anzahl oder Zielgröße; kopiert wird per copy_range, unabhängig von der Teilgröße mit konstantem Speicher
+        ranges = self.part_ranges(os.path.getsize(file_path), parts, part_size)
+        temp_folder = temp_folder+'/'+(os.path.basename(file_path))
+        if not os.path.exists(temp_folder):
+            os.makedirs(temp_folder)
+        else:
+            for f in os.listdir(temp_folder):
+                os.remove(os.path.join(temp_folder, f))
+        
+        with open(file_path, 'rb') as f:
+            for i, (offset, length) in enumerate(ranges):
+                part_path = os.path.join(temp_folder, f"{os.path.basename(file_path)}.part{i}")
+                with open(part_path, 'wb') as part_file:
+                    copy_range(f.fileno(), part_file.fileno(), offset, 0, length)
+        return temp_folder
+    
+    
+    def merge_file_parts(self, local_folder, temp_folder, filename, parts=None):
+        base_name = os.path.basename(filename)
+        temp_folder = os.path.join(temp_folder, base_name)
+
+        if not os.path.isdir(temp_folder):
+            return False
+
+        output_path = os.path.join(temp_folder, base_name)
+        if not parts:
+            # Anzahl aus den vorhandenen <name>.partN ableiten
+            prefix = f"{base_name}.part"
+            parts = len([f for f in os.listdir(temp_folder) if f.startswith(prefix) and f[len(prefix):].isdigit()])
+            if not parts:
+                return False
+
+        # Mit hochgeladene Metadaten (<name>.pyuploader.json): komprimierte Teile beim Zusammenführen entpacken
+        compressed = {}
+        meta_path = os.path.join(temp_folder, base_name + COMPRESSION_META_SUFFIX)
+        if os.path.exists(meta_path):
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                compressed = json.load(f).get('files', {})
+
+        try:
+            with open(output_path, 'wb') as out_f:
+                offset = 0
+                for i in range(int(parts)):
+                    part_name = f"{base_name}.part{i}"
+                    part_path = os.path.join(temp_folder, part_name)
+                    if not os.path.exists(part_path):
+                        # Missing part -> abort
+                        return False
+                    with open(part_path, 'rb') as pf:
+                        if part_name in compressed:
+                            size = 0
+                            os.lseek(out_f.fileno(), offset, os.SEEK_SET)
+                            chunks = iter(lambda: pf.read(COPY_BUFFER_SIZE), b'')
+                            for data in iter_decompressed(compressed[part_name]['codec'], chunks):
+                                view = memoryview(data)
+                                while view:
+                                    view = view[os.write(out_f.fileno(), view):]
+                                size += len(data)
+                            if size != compressed[part_name]['size']:
+                                return False
+                        else:
+                            size = os.fstat(pf.fileno()).st_size
+                            if copy_range(pf.fileno(), out_f.fileno(), 0, offset, size) != size:
+                                return False
+                        offset += size
+            shutil.move(output_path, os.path.join(local_folder, base_name))
+            # Remove parts and the temporary folder
+            for f in os.listdir(temp_folder):
+                try:
+                    os.remove(os.path.join(temp_folder, f))
+                except Exception:
+                    pass
+            try:
+                os.rmdir(temp_folder)
+            except Exception:
+                pass
+
+            return True
+        except Exception:
+            return False
+        
+    
+
+    def download_folder(self, remote_folder, filename,local_folder):
+        # Build the relative path for the requested folder on the WebDAV tree
+        if remote_folder:
+            req_rel = f"{remote_folder.rstrip('/')}/{filename}".strip('/')
+        else:
+            req_rel = filename.strip('/')
+
+        temp_folder = local_folder+'/'+(os.path.basename(filename))
+
+        if not os.path.exists(temp_folder):
+            os.makedirs(temp_folder)
+        else:
+            for f in os.listdir(temp_folder):
+                os.remove(os.path.join(temp_folder, f))
+
+        entries = self.list_folder(req_rel)
+        if entries is None:
+            return False
+
+        # For each child of the folder, download or recurse
+        for entry in entries:
+            # Local target for the item
+            item_local_path = os.path.join(temp_folder, entry['name'])
+
+            if entry['is_dir']:
+                # Recurse into subfolder
+                self.download_folder(entry['parent'], entry['name'], item_local_path)
+            else:
+                # Download the file into the containing local folder
+                self.download_file(entry['parent'], entry['name'], temp_folder)
+
+        return True
+
+    def list_folder(self, remote_path):
+        # PROPFIND (Depth 1) auf einen Ordner; liefert die Kinder als Liste von Dicts oder None bei Fehlern
+        try:
+            return list(self.iter_folder(remote_path))
+        except (requests.RequestException, ET.ParseError):
+            return None
+
+    def iter_folder(self, remote_path, depth='1'):
+        # Streamt die PROPFIND-Antwort und parst sie inkrementell; jedes <response> wird nach dem
+        # Auswerten verworfen, damit auch riesige Listings (Depth: infinity) wenig Speicher brauchen.
+        req_rel = remote_path.strip('/')
+        url = self.get_webdav_url(req_rel)
+        propfind_body = ('<?xml version="1.0" encoding="utf-8"?>'
+                         '<propfind xmlns="DAV:">'
+                         '<prop><displayname/><resourcetype/><getcontentlength/><getetag/><getlastmodified/>'
+                         '</prop></propfind>')
+        headers = {'Depth': depth}
+        with self._request('PROPFIND', url, data=propfind_body, headers=headers, stream=True) as r:
+            # Rohantwort nur bei aktiviertem Debug-Mitschnitt und nur bis debug_capture_limit speichern
+            capture = [] if self.debug_capture else None
+            captured = 0
+            if r.status_code != 207:
+                if capture is not None:
+                    self.last_webdav_response = r.text[:self.debug_capture_limit]
+                raise requests.HTTPError(f"PROPFIND {url}: {r.status_code}", response=r)
+
+            parser = ET.XMLPullParser(events=('start', 'end'))
+            root = None
+            for chunk in r.iter_content(64 * 1024):
+                if capture is not None and captured < self.debug_capture_limit:
+                    capture.append(chunk[:self.debug_capture_limit - captured])
+                    captured += len(capture[-1])
+                parser.feed(chunk)
+                for event, elem in parser.read_events():
+                    if event == 'start':
+                        if root is None:
+                            root = elem
+                        continue
+                    if elem.tag != '{DAV:}response':
+                        continue
+                    entry = self._parse_response(elem, req_rel)
+                    root.clear()
+                    if entry is not None:
+                        yield entry
+            parser.close()
+            if capture is not None:
+                self.last_webdav_response = b''.join(capture).decode(r.encoding or 'utf-8', 'replace')
+
+    def _parse_response(self, resp, req_rel):
+        ns = {'d': 'DAV:'}
+        href_elem = resp.find('d:href', ns)
+        if href_elem is None:
+            return None
+        href = unquote(href_elem.text or '')
+        parsed = urlparse(href)
+        href_path = parsed.path if parsed.path else href
+
+        # Compute the path relative to the WebDAV root
+        wdp = self.webdav_path.rstrip('/')
+        if wdp and wdp in href_path:
+            rel = href_path.split(wdp, 1)[1].lstrip('/')
+        else:
+            rel = href_path.lstrip('/')
+        rel = rel.strip('/')
+
+        # The requested folder itself is not a child
+        if not rel or rel == req_rel.strip('/'):
+            return None
+
+        parent, name = posixpath.split(rel)
+        remote_parent = '/' + parent if parent else ''
+
+        # Determine if resource is a directory (collection), its size, ETag and mtime
+        prop = resp.find('d:propstat/d:prop', ns)
+        is_dir = False
+        size = None
+        etag = None
+        mtime = None
+        if prop is not None:
+            resourcetype = prop.find('d:resourcetype', ns)
+            if resourcetype is not None and resourcetype.find('d:collection', ns) is not None:
+                is_dir = True
+            length = prop.find('d:getcontentlength', ns)
+            if length is not None and (length.text or '').strip().isdigit():
+                size = int(length.text.strip())
+            getetag = prop.find('d:getetag', ns)
+            if getetag is not None and getetag.text:
+                etag = getetag.text.strip()
+            lastmodified = prop.find('d:getlastmodified', ns)
+            if lastmodified is not None and lastmodified.text:
+                mtime = lastmodified.text.strip()
+
+        return {'path': rel, 'parent': remote_parent, 'name': name,
+                'is_dir': is_dir, 'size': size, 'etag': etag, 'mtime': mtime}
+
+    def iter_tree(self, remote_folder):
+        # Ganzer Baum in einem Depth-infinity-Request; lehnt der Server das ab, Ordner für Ordner mit Depth 1.
+        # Liefert (Pfad relativ zu remote_folder, Eintrag).
+        # Ein 207 allein heißt nicht, dass infinity unterstützt wird: SabreDAV/Nextcloud beschränken ohne
+        # enablePropfindDepthInfinity stillschweigend auf Depth 1. Ordner ohne Einträge darunter werden daher
+        # einzeln nachgelistet; ohne jeden tieferen Eintrag gilt infinity als nicht verfügbar.
+        root = remote_folder.strip('/')
+
+        def relative(entry):
+            return entry['path'][len(root):].strip('/') if root else entry['path']
+
+        pending = [root]
+        if self.depth_infinity is not False:
+            entries = self.iter_folder(root, depth='infinity')
+            try:
+                first = next(entries, None)
+            except requests.HTTPError as e:
+                if e.response is None or e.response.status_code not in [400, 403, 405, 412, 501]:
+                    raise
+                self.depth_infinity = False
+            else:
+                def streamed():
+                    if first is not None:
+                        yield first
+                        yield from entries
+
+                folders = []
+                parents = set()
+                deeper = False
+                for entry in streamed():
+                    rel = relative(entry)
+                    deeper = deeper or '/' in rel
+                    parents.add(entry['parent'].strip('/'))
+                    if entry['is_dir']:
+                        folders.append(entry['path'])
+                    yield rel, entry
+                if deeper:
+                    self.depth_infinity = True
+                elif folders:
+                    self.depth_infinity = False
+                pending = [folder for folder in folders if folder.strip('/') not in parents]
+
+        while pending:
+            folder = pending.pop()
+            for entry in self.iter_folder(folder):
+                yield relative(entry), entry
+                if entry['is_dir']:
+                    pending.append(entry['path'])
+
+    def list_tree(self, remote_folder):
+        # Rekursives Listing; Schlüssel ist der Pfad relativ zu remote_folder. None bei Fehlern.
+        try:
+            return dict(self.iter_tree(remote_folder))
+        except (requests.RequestException, ET.ParseError):
+            return None
+
+    def sync_folder(self, local_folder, remote_folder, direction='upload', index_path=None, dry_run=False,
+                    workers=4, retries=2, bulk_threshold=None):
+        # Inkrementeller Abgleich: nur neue oder geänderte Dateien werden übertragen.
+        # Der Stand nach dem letzten Lauf liegt in einem SQLite-Index (Standard: im lokalen Ordner).
+        index_path = index_path or os.path.join(local_folder, '.pyuploader-sync.sqlite')
+        remote_root = '/' + remote_folder.strip('/')
+        report = {'success': False, 'direction': direction, 'dry_run': dry_run, 'actions': [],
+                  'files_transferred': 0, 'bytes_transferred': 0, 'files_skipped': 0, 'bytes_skipped': 0}
+
+        status = self._propfind_status(remote_root)
+        if status == 404:
+            remote = {}
+        elif status == 207:
+            remote = self.list_tree(remote_root)
+        else:
+            remote = None
+        if remote is None:
+            return report
+        local = {}
+        if os.path.isdir(local_folder):
+            for root, _, files in os.walk(local_folder):
+                for file in files:
+                    path = os.path.join(root, file)
+                    if os.path.abspath(path).startswith(os.path.abspath(index_path)):
+                        continue
+                    stat = os.stat(path)
+                    local[os.path.relpath(path, local_folder).replace(os.sep, '/')] = (stat.st_size, stat.st_mtime)
+
+        if not dry_run:
+            # Der Index liegt standardmäßig im Zielordner, der beim ersten Download evtl. noch fehlt
+            os.makedirs(os.path.dirname(os.path.abspath(index_path)), exist_ok=True)
+        index = SyncIndex(index_path) if (not dry_run or os.path.exists(index_path)) else None
+        known = index.load(remote_root) if index else {}
+        source = local if direction == 'upload' else {r: (e['size'], None) for r, e in remote.items() if not e['is_dir']}
+        in_sync = []
+        for rel in sorted(source):
+            size = source[rel][0]
+            previous = known.get(rel)
+            entry = remote.get(rel)
+            state = local.get(rel)
+            unchanged = (previous is not None and entry is not None and state is not None
+                         and not entry['is_dir']
+                         and previous['remote_etag'] == entry['etag'] and previous['remote_size'] == entry['size']
+                         and previous['local_size'] == state[0] and previous['local_mtime'] == state[1])
+            if unchanged:
+                report['files_skipped'] += 1
+                report['bytes_skipped'] += size
+                in_sync.append(rel)
+            else:
+                exists = entry if direction == 'upload' else state
+                report['actions'].append({'path': rel, 'size': size, 'action': 'update' if exists else 'new'})
+
+        if dry_run:
+            if index:
+                index.close()
+            report['success'] = True
+            return report
+
+        transferred = []
+        if direction == 'upload' and report['actions']:
+            folders = set()
+            for action in report['actions']:
+                parent = posixpath.dirname(action['path'])
+                while parent and parent not in remote:
+                    folders.add(f"{remote_root.rstrip('/')}/{parent}")
+                    parent = posixpath.dirname(parent)
+            result = {'folders': []}
+            if self._create_collections([remote_root] + sorted(folders), result):
+                jobs = []
+                for action in report['actions']:
+                    parent = posixpath.dirname(action['path'])
+                    jobs.append({'local': os.path.join(local_folder, *action['path'].split('/')),
+                                 'remote_dir': f"{remote_root.rstrip('/')}/{parent}".rstrip('/'),
+                                 'name': posixpath.basename(action['path']),
+                                 'offset': 0, 'length': None, 'size': action['size'], 'path': action['path']})
+                for job, res in zip(jobs, self._upload_batched(jobs, workers, retries, bulk_threshold)):
+                    if res['success']:
+                        transferred.append(job['path'])
+        elif direction == 'download':
+            def download(action):
+                parent, name = posixpath.split(action['path'])
+                target = os.path.join(local_folder, *parent.split('/')) if parent else local_folder
+                os.makedirs(target, exist_ok=True)
+                for _ in range(retries + 1):
+                    try:
+                        if self.download_file(f"{remote_root.rstrip('/')}/{parent}".rstrip('/'), name, target):
+                            return True
+                    except requests.RequestException:
+                        pass
+                print(f"Fehler beim Herunterladen von: {action['path']}")
+                return False
+
+            with ThreadPoolExecutor(max_workers=max(1, int(workers))) as executor:
+                for action, ok in zip(report['actions'], executor.map(download, report['actions'])):
+                    if ok:
+                        transferred.append(action['path'])
+
+        for rel in transferred:
+            report['files_transferred'] += 1
+            report['bytes_transferred'] += source[rel][0]
+
+        # Index nur für erfolgreich übertragene bzw. unveränderte Dateien fortschreiben
+        if transferred:
+            remote = self.list_tree(remote_root) or {}
+        rows = {}
+        for rel in in_sync + transferred:
+            entry = remote.get(rel)
+            path = os.path.join(local_folder, *rel.split('/'))
+            if entry is None or not os.path.exists(path):
+                continue
+            stat = os.stat(path)
+            rows[rel] = {'remote_size': entry['size'], 'remote_etag': entry['etag'], 'remote_mtime': entry['mtime'],
+                         'local_size': stat.st_size, 'local_mtime': stat.st_mtime}
+        index.update(remote_root, rows)
+        index.remove(remote_root, [rel for rel in known if rel not in remote and rel not in local])
+        index.close()
+
+        report['success'] = len(transferred) == len(report['actions'])
+        return report
+
+    def _propfind_status(self, remote_path):
+        # Depth-0 PROPFIND: 207 = vorhanden, 404 = fehlt, 0 = Verbindungsfehler
+        try:
+            return self._request('PROPFIND', self.get_webdav_url(remote_path), headers={'Depth': '0'}).status_code
+        except requests.RequestException:
+            return 0
+
+    def download_file_parts(self, remote_folder, filename, local_folder, parts=None, workers=4, retries=2,
+                            progress=None):
+        # Teile <name>.partN direkt an ihren Offset in die vorab angelegte Zieldatei schreiben,
+        # ohne Temp-Ordner und ohne separaten Merge-Durchlauf.
+        base_name = os.path.basename(filename)
+        req_rel = f"{remote_folder.rstrip('/')}/{base_name}".strip('/')
+        report = {'success': False, 'local': os.path.join(local_folder, base_name), 'parts': []}
+
+        entries = self.list_folder(req_rel)
+        if entries is None:
+            return report
+        part_sizes = {}
+        part_etags = {}
+        prefix = f"{base_name}.part"
+        compressed = {}
+        for entry in entries:
+            suffix = entry['name'][len(prefix):]
+            if not entry['is_dir'] and entry['name'].startswith(prefix) and suffix.isdigit():
+                part_sizes[int(suffix)] = entry['size']
+                part_etags[int(suffix)] = entry['etag']
+            elif entry['name'] == base_name + COMPRESSION_META_SUFFIX:
+                compressed = self._get_compression_meta(req_rel, base_name)
+        for i in part_sizes:
+            # Offsets und Zielgröße folgen den Originalgrößen komprimierter Teile
+            if f"{prefix}{i}" in compressed:
+                part_sizes[i] = compressed[f"{prefix}{i}"]['size']
+
+        count = int(parts) if parts else len(part_sizes)
+        if count < 1 or any(part_sizes.get(i) is None for i in range(count)):
+            print(f"Teile fehlen oder ohne Größe in {req_rel}")
+            return report
+
+        jobs = []
+        offset = 0
+        for i in range(count):
+            jobs.append({'url': f"{self.get_webdav_url(req_rel)}{prefix}{i}", 'name': f"{prefix}{i}",
+                         'offset': offset, 'length': part_sizes[i],
+                         'codec': compressed.get(f"{prefix}{i}", {}).get('codec')})
+            offset += part_sizes[i]
+
+        expected = {'kind': 'download', 'remote': req_rel, 'size': offset,
+                    'parts': [[job['name'], job['length'], part_etags.get(i), job['codec']]
+                              for i, job in enumerate(jobs)]}
+        report['parts'] = self._download_resumable(jobs, report['local'], offset, expected, workers, retries,
+                                                   progress)
+        report['success'] = all(p['success'] for p in report['parts'])
+        if not report['success']:
+            print(f"Download fehlgeschlagen: {req_rel}")
+        return report
+
+    def _download_resumable(self, jobs, local_path, size, expected, workers, retries, progress=None):
+        # Lädt nach <local>.download; das Journal daneben hält fest, welche Bereiche schon geschrieben sind.
+        # Bei einem erneuten Versuch mit unveränderter Quelle werden nur fehlende Bereiche geladen.
+        download_path = local_path + '.download'
+        journal = TransferJournal(download_path + '.journal')
+        results = []
+        if progress:
+            progress.set_total(size)
+        if (journal.load(**expected) and os.path.exists(download_path)
+                and os.path.getsize(download_path) == size):
+            pending = []
+            for job in jobs:
+                if journal.confirmed(job['name']):
+                    results.append({'remote': job['name'], 'offset': job['offset'], 'size': job['length'],
+                                    'success': True, 'bytes': job['length'], 'attempts': 0, 'skipped': True})
+                    if progress:
+                        progress.add(job['length'])
+                        progress.part(job['name'], 'skipped')
+                else:
+                    pending.append(job)
+            print(f"Fortsetzen: {len(jobs) - len(pending)} von {len(jobs)} Teilen bereits geladen")
+            jobs = pending
+        else:
+            self._preallocate(download_path, size)
+            journal.start(**expected)
+
+        results += self._download_jobs(jobs, download_path, workers, retries, journal, progress)
+        if all(r['success'] for r in results):
+            os.replace(download_path, local_path)
+            journal.remove()
+        return results
+
+    @staticmethod
+    def _preallocate(local_path, size):
+        with open(local_path, 'wb') as f:
+            if size and hasattr(os, 'posix_fallocate'):
+                try:
+                    os.posix_fallocate(f.fileno(), 0, size)
+                except OSError:
+                    f.truncate(size)
+            else:
+                f.truncate(size)
+
+    def _fetch_into(self, url, local_path, offset, length, headers=None, progress=None, codec=None):
+        # Antwort-Stream an Position offset in die (vorab angelegte) Datei schreiben; gibt die Bytes zurück.
+        # Mit codec wird der Stream beim Schreiben entpackt, length ist dann die entpackte Größe.
+        written = 0
+        try:
+            with self._request('GET', url, stream=True, headers=headers) as r:
+                if r.status_code not in [200, 206]:
+                    return -r.status_code
+                if r.status_code == 200 and headers and 'Range' in headers:
+                    # Range ignoriert: vollständige Datei statt Segment
+                    return -200
+                chunks = r.iter_content(self.download_buffer_size)
+                if codec:
+                    chunks = iter_decompressed(codec, chunks, self.download_buffer_size)
+                with open(local_path, 'r+b') as f:
+                    f.seek(offset)
+                    for chunk in chunks:
+                        if length is not None and written + len(chunk) > length:
+                            return -1
+                        if progress:
+                            progress.check()
+                        f.write(chunk)
+                        written += len(chunk)
+                        if progress:
+                            progress.add(len(chunk))
+            return written
+        except ValueError:
+            # Komprimierter Teil beschädigt oder abgeschnitten
+            return -1
+        finally:
+            if progress and written != length:
+                # Unvollständiger Versuch zählt nicht als Fortschritt
+                progress.add(-written)
+
+    def _download_jobs(self, jobs, local_path, workers, retries, journal=None, progress=None):
+        def download(job):
+            result = {'remote': job['name'], 'offset': job['offset'], 'size': job['length'],
+                      'success': False, 'bytes': 0, 'attempts': 0}
+            if progress:
+                progress.part(job['name'], 'running')
+            while result['attempts'] <= retries and not result['success']:
+                result['attempts'] += 1
+                try:
+                    written = self._fetch_into(job['url'], local_path, job['offset'], job['length'],
+                                               job.get('headers'), progress, job.get('codec'))
+                except requests.RequestException:
+                    written = 0
+                # Negative Werte: HTTP-Fehler bzw. mehr Daten als erwartet
+                result['bytes'] = written
+                result['success'] = written == job['length']
+                if written == -200:
+                    # Range wird ignoriert, weitere Versuche bringen nichts
+                    break
+            if result['success'] and journal:
+                journal.confirm(job['name'], size=job['length'])
+            elif not result['success']:
+                print(f"Fehler beim Herunterladen von: {job['name']}")
+            if progress:
+                progress.part(job['name'], 'done' if result['success'] else 'failed')
+            return result
+
+        with ThreadPoolExecutor(max_workers=max(1, int(workers))) as executor:
+            return list(executor.map(download, jobs))
+
+    def download_file(self, remote_folder, filename, local_folder, progress=None, codec=None):
+        # Mit codec wird der Stream beim Schreiben entpackt (siehe upload_file mit compression)
+        url = f"{self.get_webdav_url(remote_folder)}{filename}"
+        with self._request('GET', url, stream=True) as r:
+            if r.status_code == 200:
+                if progress and not codec and r.headers.get('Content-Length', '').isdigit():
+                    progress.set_total(int(r.headers['Content-Length']))
+                local_path = os.path.join(local_folder, filename)
+                chunks = r.iter_content(self.download_buffer_size)
+                if codec:
+                    chunks = iter_decompressed(codec, chunks, self.download_buffer_size)
+                try:
+                    with open(local_path, 'wb') as f:
+                        for chunk in chunks:
+                            if progress:
+                                progress.check()
+                            f.write(chunk)
+                            if progress:
+                                progress.add(len(chunk))
+                except ValueError:
+                    print(f"Entpacken fehlgeschlagen: {filename}")
+                    return False
+                return True
+        return False
+
+    def download_file_segmented(self, remote_folder, filename, local_folder, segments=4, retries=2, progress=None):
+        # Eine große Datei über mehrere Verbindungen per Range-Request laden, jedes Segment an seinen Offset.
+        # Ohne Range-Unterstützung (oder bei kleinen Dateien) wird auf download_file zurückgefallen.
+        url = f"{self.get_webdav_url(remote_folder)}{filename}"
+        local_path = os.path.join(local_folder, filename)
+        report = {'success': False, 'strategy': 'segmented', 'local': local_path, 'segments': []}
+        compressed = self._get_compression_meta(remote_folder, filename).get(filename)
+        if compressed:
+            # Komprimiert abgelegt: Byte-Bereiche lassen sich nicht einzeln entpacken -> ein Stream
+            report['strategy'] = 'compressed'
+            if progress:
+                progress.set_total(compressed['size'])
+            report['success'] = self.download_file(remote_folder, filename, local_folder, progress,
+                                                   compressed['codec'])
+            return report
+        try:
+            head = self._request('HEAD', url)
+        except requests.RequestException:
+            return report
+        if head.status_code != 200:
+            return report
+        size = head.headers.get('Content-Length', '')
+        ranges = head.headers.get('Accept-Ranges', '').lower() == 'bytes'
+        segments = max(1, int(segments))
+
+        if not size.isdigit() or not ranges or segments == 1 or int(size) < 2 * self.min_segment_size:
+            report['strategy'] = 'single'
+            report['success'] = self.download_file(remote_folder, filename, local_folder, progress)
+            return report
+
+        size = int(size)
+        segment_size = max(self.min_segment_size, -(-size // segments))
+        jobs = []
+        for offset in range(0, size, segment_size):
+            end = min(offset + segment_size, size) - 1
+            jobs.append({'url': url, 'name': f"{filename} [{offset}-{end}]", 'offset': offset,
+                         'length': end - offset + 1, 'headers': {'Range': f"bytes={offset}-{end}"}})
+
+        expected = {'kind': 'download', 'remote': f"{remote_folder.rstrip('/')}/{filename}", 'size': size,
+                    'etag': head.headers.get('ETag'), 'segment_size': segment_size}
+        report['segments'] = self._download_resumable(jobs, local_path, size, expected, segments, retries, progress)
+        report['success'] = all(s['success'] for s in report['segments'])
+        if not report['success'] and any(s['bytes'] == -200 for s in report['segments']):
+            # Server hat den Range-Header ignoriert -> einfacher Stream
+            os.remove(local_path + '.download')
+            os.remove(local_path + '.download.journal')
+            report['strategy'] = 'single'
+            report['success'] = self.download_file(remote_folder, filename, local_folder, progress)
+        return report
+
+    def download_file_dedup(self, remote_folder, filename, local_folder, version=None, workers=4, retries=2,
+                            cache_folder=None, progress=None):
+        # Datei aus ihrem Manifest (Standard: neueste Version) wieder zusammensetzen.
+        # Bekannte Chunks kommen aus der vorhandenen lokalen Datei (vorige Version) bzw. aus cache_folder,
+        # nur der Rest wird parallel geladen. Neu geladene Chunks landen im Cache, falls angegeben.
+        base_name = os.path.basename(filename)
+        versions = f"{remote_folder.rstrip('/')}/{base_name}.versions"
+        local_path = os.path.join(local_folder, base_name)
+        report = {'success': False, 'local': local_path, 'manifest': None, 'chunks': 0, 'chunks_downloaded': 0,
+                  'bytes_downloaded': 0, 'bytes_reused': 0, 'parts': []}
+
+        if version is None:
+            names = sorted(e['name'] for e in (self.list_folder(versions) or [])
+                           if not e['is_dir'] and e['name'].endswith('.json'))
+            if not names:
+                print(f"Kein Manifest gefunden: {versions}")
+                return report
+            version = names[-1]
+        try:
+            r = self._request('GET', f"{self.get_webdav_url(versions)}{version}")
+            manifest = r.json() if r.status_code == 200 else None
+        except (requests.RequestException, ValueError):
+            manifest = None
+        if not manifest:
+            print(f"Manifest nicht lesbar: {versions}/{version}")
+            return report
+        report['manifest'] = f"{versions}/{version}"
+        report['chunks'] = len(manifest['chunks'])
+        store = manifest['chunk_store']
+
+        # Bekannte Chunks: vorige lokale Version und Cache. Die Chunk-Liste der lokalen Datei stammt aus dem
+        # Index des letzten Downloads bzw. aus dem Manifest, wenn Größe und mtime passen; nur sonst wird die
+        # Datei mit denselben Chunking-Parametern neu zerlegt.
+        known = {}
+        chunking = manifest['chunking']
+        index_path = local_path + CDC_INDEX_SUFFIX
+        if os.path.isfile(local_path):
+            stat = os.stat(local_path)
+            local_chunks = None
+            try:
+                with open(index_path, 'r', encoding='utf-8') as f:
+                    index = json.load(f)
+                if (index['size'], index['mtime_ns'], index['chunking']) == (stat.st_size, stat.st_mtime_ns,
+                                                                             chunking):
+                    local_chunks = index['chunks']
+            except (OSError, ValueError, KeyError, TypeError):
+                pass
+            if local_chunks is None and (stat.st_size, stat.st_mtime) == (manifest['size'], manifest['mtime']):
+                local_chunks = manifest['chunks']
+            if local_chunks is not None:
+                offset = 0
+                for digest, length in local_chunks:
+                    known.setdefault(digest, (local_path, offset))
+                    offset += length
+            else:
+                with open(local_path, 'rb') as f:
+                    for offset, data in iter_cdc_chunks(f, chunking['min'], chunking['avg'], chunking['max']):
+                        if progress:
+                            progress.check()
+                        known.setdefault(hashlib.sha256(data).hexdigest(), (local_path, offset))
+        if cache_folder:
+            os.makedirs(cache_folder, exist_ok=True)
+            for digest, _ in manifest['chunks']:
+                if digest not in known and os.path.isfile(os.path.join(cache_folder, digest)):
+                    known[digest] = (os.path.join(cache_folder, digest), 0)
+
+        download_path = local_path + '.download'
+        self._preallocate(download_path, manifest['size'])
+        layout = []
+        jobs = {}
+        offset = 0
+        for digest, length in manifest['chunks']:
+            layout.append((digest, offset, length))
+            if digest not in known and digest not in jobs:
+                jobs[digest] = {'url': f"{self.get_webdav_url(f'{store}/{digest[:2]}')}{digest}", 'name': digest,
+                                'offset': offset, 'length': length}
+            offset += length
+        if progress:
+            progress.set_total(sum(job['length'] for job in jobs.values()))
+        print(f"Dedup: {len(jobs)} von {len(layout)} Chunks werden geladen")
+        report['parts'] = self._download_jobs(list(jobs.values()), download_path, workers, retries,
+                                              progress=progress)
+        report['chunks_downloaded'] = sum(1 for p in report['parts'] if p['success'])
+        report['bytes_downloaded'] = sum(p['size'] for p in report['parts'] if p['success'])
+        if not all(p['success'] for p in report['parts']):
+            print(f"Download fehlgeschlagen: {report['manifest']}")
+            return report
+
+        # Restliche Stellen aus bekannten Chunks bzw. aus bereits geladenen Stellen der Zieldatei füllen
+        with open(download_path, 'r+b') as out_f:
+            for digest, offset, length in layout:
+                if digest in jobs and jobs[digest]['offset'] == offset:
+                    continue
+                source, source_offset = known.get(digest) or (download_path, jobs[digest]['offset'])
+                with open(source, 'rb') as src_f:
+                    if copy_range(src_f.fileno(), out_f.fileno(), source_offset, offset, length) != length:
+                        return report
+                report['bytes_reused'] += length
+            if cache_folder:
+                for digest, job in jobs.items():
+                    with open(os.path.join(cache_folder, digest), 'wb') as cache_f:
+                        copy_range(out_f.fileno(), cache_f.fileno(), job['offset'], 0, job['length'])
+
+        file_hash = hashlib.sha256()
+        with open(download_path, 'rb') as f:
+            for data in iter(lambda: f.read(COPY_BUFFER_SIZE), b''):
+                file_hash.update(data)
+        if file_hash.hexdigest() != manifest['sha256']:
+            print(f"Prüfsumme stimmt nicht: {report['manifest']}")
+            # Ein unpassender Index darf den nächsten Versuch nicht wieder in die Irre führen
+            if os.path.exists(index_path):
+                os.remove(index_path)
+            return report
+        os.replace(download_path, local_path)
+        stat = os.stat(local_path)
+        try:
+            with open(index_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': 1, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'chunking': chunking,
+                           'chunks': manifest['chunks']}, f)
+        except OSError:
+            pass
+        report['success'] = True
+        return report
+
+    def get_last_webdav_response(self):
+        return getattr(self, 'last_webdav_response', '')